@@ -0,0 +1,210 @@
+from container.Builder import Builder as DockerBuilder
+from container.SharedClient import SharedClient
+from task.OutputParser import OutputParser
+from task.TaskInterface import TaskInterface
+from task.TaskRegistry import TaskRegistry
+from typing import Any, Dict
+from xmlrpc.server import SimpleXMLRPCServer
+import argparse
+import hmac
+import importlib
+import json
+import os
+import psutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+import xmlrpc.client
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+class TaskAgent:
+    """
+    Worker agent for multi-node execution. Registers its CPU and memory capacity with a
+    commander started with agent_port, runs the tasks the commander places on it with its
+    own Docker daemon or as containerless TaskLauncher processes, and reports each
+    finished run back together with its output files. Only calls carrying the token shared
+    with the commander are accepted, and only for tasks listed in the TaskRegistry.
+    """
+    HEARTBEAT_INTERVAL = 5.0
+
+    def __init__(
+        self,
+        commander_url: str,
+        token: str,
+        host: str,
+        port: int,
+        run_containerless: bool = True,
+        cpus: float | None = None,
+        memory_gb: float | None = None,
+        agent_id: str | None = None
+    ) -> None:
+        self._commander_url = commander_url
+        self._token = token
+        self._host = host
+        self._port = port
+        self._run_containerless = run_containerless
+        self._cpus = float(cpus or psutil.cpu_count() or 1)
+        self._memory_gb = float(memory_gb or psutil.virtual_memory().total / (1024**3))
+        self._agent_id = agent_id or f"{socket.gethostname()}:{port}"
+        self._container_builder = DockerBuilder(role=DockerBuilder.AGENT_ROLE)
+        self._docker_client = SharedClient()
+        self._output_parser = OutputParser()
+        self._processes = {}
+        self._containers = {}
+
+    def serve(self) -> None:
+        """Accept launches from the commander and keep the registration alive forever."""
+        server = SimpleXMLRPCServer((self._host, self._port), allow_none=True, logRequests=False)
+        server.register_function(self._launch, 'launch')
+        server.register_function(self._stop, 'stop')
+        threading.Thread(target=server.serve_forever, name="agent-rpc", daemon=True).start()
+        self._print(f"agent '{self._agent_id}' serving on port {self._port}: {self._cpus} cpus, {self._memory_gb:.1f} GB")
+        is_registered = False
+        while True:
+            try:
+                commander = self._get_commander()
+                if not is_registered or not commander.heartbeat(self._token, self._agent_id):
+                    is_registered = commander.register(self._token, self._agent_id, self._get_url(), self._cpus, self._memory_gb)
+                    if is_registered:
+                        self._print(f"registered with commander at {self._commander_url}")
+                    else:
+                        self._print(f"commander at {self._commander_url} refused the registration, check the agent token")
+            except Exception as e:
+                is_registered = False
+                self._print(f"commander not reachable: {e}")
+            time.sleep(self.HEARTBEAT_INTERVAL)
+
+    def _launch(self, token: str, run_key: str, task_module: str, params_json: str) -> bool:
+        """Raise, which the commander receives as an XML-RPC fault, for launches this agent must not run."""
+        if not self._is_authorized(token):
+            raise PermissionError("invalid agent token")
+        if task_module not in TaskRegistry.TASKS.values():
+            raise ValueError(f"task module '{task_module}' is not in the TaskRegistry")
+        params = json.loads(params_json)
+        output_name = params.get('shard', {}).get('output_name', run_key) if isinstance(params, dict) else run_key
+        if not DockerBuilder.is_safe_name(run_key) or not DockerBuilder.is_safe_name(output_name):
+            raise ValueError(f"invalid run key '{run_key}' or output name '{output_name}'")
+        thread = threading.Thread(target=self._execute, args=(run_key, task_module, params), daemon=True)
+        thread.start()
+        return True
+
+    def _stop(self, token: str, run_key: str) -> bool:
+        if not self._is_authorized(token):
+            raise PermissionError("invalid agent token")
+        if run_key in self._processes:
+            self._processes[run_key].terminate()
+        elif run_key in self._containers:
+            self._containers[run_key].kill()
+        return True
+
+    def _execute(self, run_key: str, task_module: str, params: Dict[str, Any]) -> None:
+        params['outdir'] = self._container_builder.get_out_dir(not self._run_containerless)
+        params['in_container'] = not self._run_containerless
+        exit_code = None
+        try:
+            self._print(f"running '{run_key}'")
+            exit_code = self._run_worker(run_key, task_module, params) \
+                if self._run_containerless else \
+                self._run_container(run_key, self._load_task(task_module), params)
+            output = {
+                'text': self._output_parser.get_text(run_key),
+                'html': self._output_parser.get_html(run_key),
+                'data': self._output_parser.get_json(run_key),
+            }
+        except Exception as e:
+            self._print(f"error running '{run_key}': {e}")
+            output = {'text': f"error: {e}", 'html': "", 'data': {'error': str(e)}}
+        self._print(f"finished '{run_key}', exit code: {exit_code}")
+        try:
+            if not self._get_commander().finished(self._token, self._agent_id, run_key, exit_code, json.dumps(output)):
+                self._print(f"the commander did not accept the report of '{run_key}'")
+        except Exception as e:
+            self._print(f"could not report '{run_key}' to the commander: {e}")
+
+    def _run_worker(self, run_key: str, task_module: str, params: Dict[str, Any]) -> int:
+        commander_dir = os.path.dirname(os.path.abspath(__file__))
+        cmd = [
+            sys.executable, f"{commander_dir}/TaskLauncher.py",
+            "--outdir", params['outdir'],
+            "--task", task_module,
+            "--params-file", self._container_builder.write_params_file(run_key, params, in_container=False)
+        ]
+        process = subprocess.Popen(cmd, cwd=commander_dir)
+        self._processes[run_key] = process
+        try:
+            return process.wait()
+        finally:
+            self._processes.pop(run_key, None)
+
+    def _run_container(self, run_key: str, task: TaskInterface, params: Dict[str, Any]) -> int:
+        commander_dir = os.path.dirname(os.path.abspath(__file__))
+        client = self._docker_client.get()
+        image_tag = self._container_builder.build_image(client, task, commander_dir, self._print)
+        container = client.containers.run(
+            image = image_tag,
+            command = self._container_builder.get_container_cmd(task, params),
+            detach = True,
+            working_dir = f"/app/tmp/tasks/{task.name()}/container",
+            volumes = self._container_builder.get_volumes(commander_dir, task, params),
+            ports = task.ports(params),
+            mem_limit = self._container_builder.get_memory(task.memory_gb()),
+            nano_cpus = self._container_builder.get_cpus(task.cpus()),
+            network_mode = self._container_builder.get_network_mode(task),
+            labels = self._container_builder.get_labels(task)
+        )
+        self._containers[run_key] = container
+        try:
+            return container.wait()['StatusCode']
+        finally:
+            self._containers.pop(run_key, None)
+            container.remove(force=True)
+
+    def _load_task(self, task_module: str) -> TaskInterface:
+        module = importlib.import_module(task_module)
+        return getattr(module, task_module.split('.')[-1])()
+
+    def _is_authorized(self, token: str) -> bool:
+        return isinstance(token, str) and hmac.compare_digest(token.encode(), self._token.encode())
+
+    def _get_commander(self) -> xmlrpc.client.ServerProxy:
+        return xmlrpc.client.ServerProxy(self._commander_url, allow_none=True)
+
+    def _get_url(self) -> str:
+        host = socket.gethostname() if self._host in ("", "0.0.0.0") else self._host
+        return f"http://{host}:{self._port}"
+
+    def _print(self, message: str) -> None:
+        formatted_day_time = time.strftime(TIME_FORMAT, time.localtime(time.time()))
+        print(f"[{formatted_day_time}] [agent] {message}")
+
+def _get_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument("--commander", required=True, help="Commander registry URL, e.g. http://host:7100")
+    p.add_argument("--host", default="127.0.0.1", help="Interface to accept launches on, e.g. 0.0.0.0 for a remote commander")
+    p.add_argument("--port", type=int, required=True, help="Port to accept launches on")
+    p.add_argument("--containerless", action="store_true", help="Run tasks as local processes instead of Docker containers")
+    p.add_argument("--cpus", type=float, help="CPU capacity offered to the commander (default: all cores)")
+    p.add_argument("--memory-gb", type=float, help="Memory capacity offered to the commander (default: all memory)")
+    p.add_argument("--id", help="Agent id (default: <hostname>:<port>)")
+    p.add_argument("--token", default=os.getenv("AGENT_TOKEN"), help="Token shared with the commander (default: $AGENT_TOKEN)")
+    args = p.parse_args()
+    if not args.token:
+        p.error("an agent token is required, pass --token or set AGENT_TOKEN")
+    return args
+
+if __name__ == "__main__":
+    args = _get_args()
+    agent = TaskAgent(
+        commander_url = args.commander,
+        token = args.token,
+        host = args.host,
+        port = args.port,
+        run_containerless = args.containerless,
+        cpus = args.cpus,
+        memory_gb = args.memory_gb,
+        agent_id = args.id
+    )
+    agent.serve()
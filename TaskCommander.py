@@ -1,23 +1,46 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from container.Builder import Builder as DockerBuilder
 from container.Cleaner import Cleaner
+from container.EventListener import EventListener
+from container.ResidentWorker import ResidentWorker
+from container.SharedClient import SharedClient
 from docker.errors import DockerException
 from docker.models.containers import Container
+from scheduler.AdmissionController import AdmissionController
+from scheduler.AgentRegistry import AgentRegistry
+from scheduler.LeaderLease import LeaderLease
+from scheduler.Scheduler import Scheduler
+from scheduler.StateStore import StateStore
+from scheduler.StatusReporter import StatusReporter
 from task.OutputParser import OutputParser
 from task.TaskInterface import TaskInterface
-from TaskLauncher import TaskLauncher
+from task.TaskRegistry import TaskRegistry
 from types import FrameType
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import docker
+import html
 import json
+import math
 import os
+import random
 import signal
+import socket
+import subprocess
 import sys
+import threading
 import time
 
 class TaskCommander:
     TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
     PYTHON_IMAGE = "python:3.12-slim"
     VERSION = 0.1
+    CONTAINER_POLL_INTERVAL = 1.0
+    CONTAINER_EVENT_RETENTION = 60.0
+    KEEP_ALIVE_RETRY_DELAY = 1.0
+    RESIDENT_CONNECT_TIMEOUT = 120.0
+    TIMEOUT_BACKOFF_BASE = 30.0
+    TIMEOUT_BACKOFF_MAX = 60.0 * 60.0
+    LEASE_TTL = 15.0
     
     def __init__(
         self, 
@@ -25,46 +48,105 @@ class TaskCommander:
         print_docker_container_logs: bool = False,
         print_docker_container_lifecycle: bool = False,
         run_containerless: bool = True,
-        force_rebuild: bool = True
+        force_rebuild: bool = True,
+        agent_port: int | None = None,
+        agent_host: str = "127.0.0.1",
+        agent_token: str | None = None,
+        high_availability: bool = False,
+        image_build_parallelism: int = 4,
+        pip_cache_max_gb: float = 10.0
     ):
         self._cfg = {
             'print_cycles': print_cycles,
             'print_docker_container_logs': print_docker_container_logs,
             'print_docker_container_lifecycle': print_docker_container_lifecycle,
             'run_containerless': run_containerless,
-            'force_container_rebuild': force_rebuild
+            'force_container_rebuild': force_rebuild,
+            'agent_port': agent_port,
+            'agent_host': agent_host,
+            'agent_token': agent_token,
+            'high_availability': high_availability,
+            'image_build_parallelism': image_build_parallelism,
+            'pip_cache_max_gb': pip_cache_max_gb
         }
-        self.container_builder = DockerBuilder()
+        self.container_builder = DockerBuilder(force_rebuild, pip_cache_max_gb)
         self.output_parser = OutputParser()
-        self.cleaner = Cleaner()
+        self.docker_client = SharedClient()
+        self.cleaner = Cleaner(self.docker_client)
+        self.scheduler = Scheduler()
+        self.admission_controller = AdmissionController()
+        self.status_reporter = StatusReporter()
+        self.state_store = StateStore(self._get_state_db_path())
         self.last_execution = {}
         self.running_containers = {}
+        self.resident_containers = {}
+        self.resident_mounts = {}
+        self.container_events = {}
+        self.event_listener = None
+        self._events_lock = threading.Lock()
+        self.running_workers = {}
+        self.worker_processes = {}
+        self.worker_pool = None
         self.task_registry = {}
+        self.task_dicts = {}
+        self.downstream_tasks = {}
+        self.upstream_outputs = {}
+        self.shard_runs = {}
+        self.shard_owners = {}
+        self.run_deadlines = {}
+        self.queued_deadlines = {}
+        self.worker_starts = {}
+        self.timed_out_runs = set()
+        self.timeout_counts = {}
+        self.due_overrides = {}
+        self.attempts = {}
+        self.run_jitters = {}
+        self.agent_registry = None
+        self.remote_runs = {}
+        self.leader_lease = None
+        self.leadership_lost = threading.Event()
+        self.lease_renewal_stop = threading.Event()
+        self.image_builds = {}
+        self.build_pool = None
 
     def run(self, tasks: List[dict]) -> None:
         """Main execution loop for running tasks."""
         self._initialize()
+        self._wait_for_leadership()
         self._save_tasks_config(tasks)
         self._register_tasks(tasks)
+        self._restore_state()
+        self._start_event_listener()
+        self._start_agent_registry()
         self._cleanup_orphaned()
+        self._prebuild_images()
+        self._schedule_registered_tasks()
         count = 0
         tasks_output = {}
         try:
             while True:
+                due_task_names = self.scheduler.wait(self._get_max_wait())
+                if not self._renew_leadership():
+                    self._print("Lost the scheduler lease, stepping down")
+                    break
                 count += 1
                 if self._cfg['print_cycles']:
                     self._print(f"executing cycle #{count}")
+                self._handle_finished_builds()
+                self._enforce_timeouts()
                 finished_tasks_output = self._handle_finished_tasks()
-                for task_dict in tasks:
-                    task_result = self._execute_task(task_dict)
-                    if task_result:
-                        task_name, execution_data = task_result
-                        if task_name not in finished_tasks_output:
-                            finished_tasks_output[task_name] = execution_data
-                        else:
-                            finished_tasks_output[task_name].update(execution_data)
+                for task_name in due_task_names:
+                    self._submit_task(task_name)
+                for task_name in self.admission_controller.admit():
+                    task_name, execution_data = self._execute_task(self.task_dicts[task_name])
+                    if task_name not in finished_tasks_output:
+                        finished_tasks_output[task_name] = execution_data
+                    else:
+                        finished_tasks_output[task_name].update(execution_data)
+                finished_tasks_output.update(self._place_remote_tasks())
+                self._print_waiting_tasks(due_task_names)
                 tasks_output.update(finished_tasks_output)
-                time.sleep(1)
+                self._save_status()
         except KeyboardInterrupt:
             self._print("interrupted by user")
         except Exception as e:
@@ -72,22 +154,244 @@ class TaskCommander:
         finally:
             self._cleanup_running()
 
-    def _execute_task(self, task_dict: dict) -> Tuple[str, Dict[str, Any]] | None:
-        """Execute a task if needed and return (task_name, execution_data) or None."""
+    def _submit_task(self, task_name: str) -> None:
+        """Put a due task in the admission ready queue if it has to run."""
+        task = self.task_registry[task_name]
+        if task_name in self.image_builds:
+            return
+        if not self._should_run_task(task):
+            if task_name not in self.running_workers:
+                self._schedule_next(task)
+            return
+        shard_count = self._get_shard_count(task)
+        self.admission_controller.submit(
+            task_name,
+            task.cpus() * shard_count,
+            task.memory_gb() * shard_count,
+            releasable = task.interval() is not None
+        )
+
+    def _print_waiting_tasks(self, due_task_names: List[str]) -> None:
+        """Report due tasks that could not be admitted or placed on an agent in this cycle."""
+        if not self._cfg['print_cycles']:
+            return
+        waiting_names = set(self.admission_controller.waiting())
+        for task_name in due_task_names:
+            if task_name in waiting_names:
+                self._print(f"Task '{task_name}' is due, waiting for resources")
+
+    def _execute_task(self, task_dict: dict, agent_id: str | None = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Execute an admitted task, once per shard if it is sharded, or on the worker agent it
+        was placed on, and return (task_name, execution_data).
+        """
         task = task_dict['task']
         params = task_dict['parameters']
         task_name = task.name()
-        if self._should_run_task(task):
-            execution_data = self._run_task(task, params)
-            if 'container' in execution_data:
-                self.running_containers[task_name] = execution_data['container']
-            self.last_execution[task_name] = time.time()
-            if self._cfg['run_containerless'] and task.revive():
-                self._enqueue_task(task_name)
-                if self._cfg['print_cycles']:
-                    self._print(f"Task '{task_name}' will be revived in next cycle")
-            return task_name, execution_data
-        return None
+        params['upstream'] = self.upstream_outputs.pop(task_name, {})
+        params['attempt'] = self.attempts.get(task_name, 1)
+        shard_params = self._get_shard_params(task, params)
+        if agent_id is not None:
+            execution_data = self._start_remote_run(task, agent_id, params)
+            is_started = 'agent' in execution_data
+        elif len(shard_params) > 1:
+            execution_data = self._start_shards(task, shard_params)
+            is_started = task_name in self.shard_runs
+        else:
+            execution_data = self._start_run(task, task_name, params)
+            is_started = 'container' in execution_data or 'worker' in execution_data
+        if not is_started:
+            self.admission_controller.release(task_name)
+        self.due_overrides.pop(task_name, None)
+        self.run_jitters[task_name] = random.uniform(0.0, task.jitter())
+        self.last_execution[task_name] = time.time()
+        self.state_store.record_start(task_name, self.last_execution[task_name])
+        self._schedule_next(task)
+        return task_name, execution_data
+
+    def _start_run(self, task: TaskInterface, run_key: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the task and track its container or worker under run_key (the task name, or a shard name)."""
+        execution_data = self._run_task(task, params)
+        if 'container' in execution_data:
+            self.running_containers[run_key] = execution_data['container']
+            self.state_store.add_running_container(run_key, execution_data['container'].id)
+        elif 'worker' in execution_data:
+            self.running_workers[run_key] = execution_data['worker']
+        else:
+            return execution_data
+        self._set_deadline(task, run_key)
+        return execution_data
+
+    def _wait_for_leadership(self) -> None:
+        """In high availability mode, stand by until this commander holds the scheduler lease."""
+        if not self._cfg['high_availability']:
+            return
+        commander_dir = os.path.dirname(os.path.abspath(__file__))
+        self.leader_lease = LeaderLease(
+            f"{commander_dir}/tmp/{LeaderLease.FILE_NAME}",
+            f"{socket.gethostname()}:{os.getpid()}",
+            self.LEASE_TTL
+        )
+        leader = None
+        while not self.leader_lease.acquire():
+            if self.leader_lease.get_holder() != leader:
+                leader = self.leader_lease.get_holder()
+                self._print(f"Standing by, '{leader}' holds the scheduler lease")
+            time.sleep(self.LEASE_TTL / 3)
+        self._print(f"Acquired the scheduler lease as '{self.leader_lease.holder_id}'")
+        threading.Thread(target=self._renew_leadership_loop, daemon=True).start()
+
+    def _renew_leadership_loop(self) -> None:
+        """
+        Renew the lease off the main loop, so a long synchronous step such as an image build
+        cannot let it expire while this commander is still scheduling.
+        """
+        while not self.lease_renewal_stop.wait(self.LEASE_TTL / 3):
+            if not self.leader_lease.acquire():
+                self.leadership_lost.set()
+                self.scheduler.notify()
+                return
+
+    def _renew_leadership(self) -> bool:
+        return self.leader_lease is None or not self.leadership_lost.is_set()
+
+    def _set_deadline(self, task: TaskInterface, run_key: str) -> None:
+        """A worker run's deadline only starts once the worker pool starts it, see _start_deadlines."""
+        if task.interval() is not None and task.max_time_expected() is not None:
+            if run_key in self.running_workers:
+                self.queued_deadlines[run_key] = task.max_time_expected()
+            else:
+                self.run_deadlines[run_key] = time.time() + task.max_time_expected()
+
+    def _start_deadlines(self) -> None:
+        for run_key, start_time in list(self.worker_starts.items()):
+            del self.worker_starts[run_key]
+            max_time_expected = self.queued_deadlines.pop(run_key, None)
+            if max_time_expected is not None:
+                self.run_deadlines[run_key] = start_time + max_time_expected
+
+    def _start_agent_registry(self) -> None:
+        if self._cfg['agent_port'] is None:
+            return
+        if not self._cfg['agent_token']:
+            self._print("[agent] Warning: Not accepting worker agents, agent_port requires an agent_token")
+            return
+        try:
+            self.agent_registry = AgentRegistry(
+                self._cfg['agent_host'],
+                self._cfg['agent_port'],
+                self._cfg['agent_token'],
+                self.scheduler.notify
+            )
+            self.agent_registry.start()
+            self._print(f"[agent] Accepting worker agents on {self._cfg['agent_host']}:{self._cfg['agent_port']}")
+        except Exception as e:
+            self.agent_registry = None
+            self._print(f"[agent] Warning: Could not start the agent registry: {e}")
+
+    def _place_remote_tasks(self) -> Dict[str, dict]:
+        """Run tasks still waiting for local resources on worker agents with free capacity."""
+        tasks_output = {}
+        if self.agent_registry is None or not self.agent_registry.has_agents():
+            return tasks_output
+        for task_name in self.admission_controller.waiting():
+            task = self.task_registry[task_name]
+            if not self._is_remote_eligible(task):
+                continue
+            agent_id = self.agent_registry.place(task_name, task.cpus(), task.memory_gb())
+            if agent_id is None:
+                continue
+            self.admission_controller.withdraw(task_name)
+            task_name, execution_data = self._execute_task(self.task_dicts[task_name], agent_id)
+            tasks_output[task_name] = execution_data
+        return tasks_output
+
+    def _is_remote_eligible(self, task: TaskInterface) -> bool:
+        """Keep-alive, resident, sharded and unregistered tasks always run on the commander host."""
+        return task.interval() is not None \
+            and task.__module__ in TaskRegistry.TASKS.values() \
+            and not self._is_resident(task) \
+            and self._get_shard_count(task) == 1
+
+    def _start_remote_run(self, task: TaskInterface, agent_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        task_name = task.name()
+        try:
+            self.agent_registry.launch(agent_id, task_name, task.__module__, params)
+        except Exception as e:
+            self._print(f"'{task_name}' could not be started on agent '{agent_id}': {e}")
+            return {'exception': e}
+        self.remote_runs[task_name] = agent_id
+        self._set_deadline(task, task_name)
+        if self._cfg['print_cycles']:
+            self._print(f"'{task_name}' started on agent '{agent_id}'")
+        return {
+            'agent': agent_id,
+            'task_name': task_name
+        }
+
+    def _enforce_timeouts(self) -> None:
+        """Stop every run that is past its max_time_expected() deadline; it is then collected as a finished run."""
+        self._start_deadlines()
+        now = time.time()
+        for run_key, deadline in list(self.run_deadlines.items()):
+            if now < deadline:
+                continue
+            del self.run_deadlines[run_key]
+            self.timed_out_runs.add(run_key)
+            self._print(f"Run '{run_key}' exceeded its max time expected, stopping it")
+            try:
+                if run_key in self.running_containers:
+                    self.running_containers[run_key].kill()
+                elif run_key in self.worker_processes:
+                    self.worker_processes[run_key].terminate()
+                elif run_key in self.resident_containers:
+                    container = self.resident_containers.pop(run_key)
+                    container.remove(force=True)
+                elif run_key in self.remote_runs:
+                    self.agent_registry.stop_run(self.remote_runs[run_key], run_key)
+            except Exception as e:
+                self._print(f"Warning: Could not stop run '{run_key}': {e}")
+
+    def _start_shards(self, task: TaskInterface, shard_params: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Start one run per shard; the task completes once every started shard has finished."""
+        task_name = task.name()
+        shards_data = {}
+        for index, params in enumerate(shard_params):
+            run_key = f"{task_name}.shard{index}"
+            params['shard'] = {'index': index, 'count': len(shard_params), 'output_name': run_key}
+            execution_data = self._start_run(task, run_key, params)
+            if 'container' in execution_data or 'worker' in execution_data:
+                self.shard_owners[run_key] = (task_name, index)
+                shards_data[run_key] = execution_data
+        if shards_data:
+            self.shard_runs[task_name] = {
+                'pending': set(shards_data),
+                'outputs': {},
+                'exit_code': 0 if len(shards_data) == len(shard_params) else 1,
+            }
+            if self._cfg['print_cycles']:
+                self._print(f"Task '{task_name}' started in {len(shards_data)} shard(s)")
+        return {
+            'shards': shards_data,
+            'task_name': task_name
+        }
+
+    def _get_shard_count(self, task: TaskInterface) -> int:
+        """Sharding is opt-in per task dict ('shards': N) and only applies to non-resident interval tasks."""
+        task_dict = self.task_dicts.get(task.name(), {})
+        if task.interval() is None or self._is_resident(task):
+            return 1
+        return max(1, int(task_dict.get('shards', 1)))
+
+    def _get_shard_params(self, task: TaskInterface, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        shard_count = self._get_shard_count(task)
+        if shard_count == 1:
+            return [params]
+        try:
+            return task.shard(params, shard_count)[:shard_count] or [params]
+        except Exception as e:
+            self._print(f"'{task.name()}' could not be sharded, running it as a single run: {e}")
+            return [params]
 
     def _run_task(self, task: TaskInterface, params: Dict[str, Any]) -> Dict[str, Any]:
         in_container = not self._cfg['run_containerless']
@@ -99,9 +403,42 @@ class TaskCommander:
         return task_result
 
     def _run_containerless(self, task: TaskInterface, params: Dict[str, Any]) -> Dict[str, Any]:
-        launcher = TaskLauncher(task)
-        launcher.run(params)
-        task_name = task.name()
+        """Dispatch the launch to the worker pool; completion is collected in _handle_finished_tasks."""
+        worker = self._submit_worker(self._run_worker, task, params)
+        return {
+            'worker': worker,
+            'task_name': task.name()
+        }
+
+    def _submit_worker(self, run: Callable[[TaskInterface, Dict[str, Any]], int], task: TaskInterface, params: Dict[str, Any]) -> Future:
+        """Submit a run to the worker pool and record when the pool actually starts it."""
+        run_key = params.get('shard', {}).get('output_name', task.name())
+        def start() -> int:
+            self.worker_starts[run_key] = time.time()
+            self.scheduler.notify()
+            return run(task, params)
+        worker = self.worker_pool.submit(start)
+        worker.add_done_callback(lambda _: self.scheduler.notify())
+        return worker
+
+    def _run_worker(self, task: TaskInterface, params: Dict[str, Any]) -> int:
+        """Run TaskLauncher in a child process so workers run in parallel and can be terminated."""
+        commander_dir = os.path.dirname(os.path.abspath(__file__))
+        cmd = [
+            sys.executable, f"{commander_dir}/TaskLauncher.py",
+            "--outdir", params['outdir'],
+            "--task", task.__module__,
+            "--params-file", self.container_builder.write_params_file(task.name(), params, in_container=False)
+        ]
+        run_key = params.get('shard', {}).get('output_name', task.name())
+        process = subprocess.Popen(cmd, cwd=commander_dir)
+        self.worker_processes[run_key] = process
+        try:
+            return process.wait()
+        finally:
+            self.worker_processes.pop(run_key, None)
+
+    def _get_task_output(self, task_name: str) -> Dict[str, Any]:
         output_txt = self.output_parser.get_text(task_name)
         output_data = self.output_parser.get_json(task_name)
         output_html = self.output_parser.get_html(task_name)
@@ -113,6 +450,8 @@ class TaskCommander:
         return task_output
     
     def _run_in_container(self, task: TaskInterface, params: Dict[str, Any]) -> Dict[str, Any]:
+        if self._is_resident(task):
+            return self._run_resident(task, params)
         try:
             container = self._run_container(task, params)
             execution_data = {
@@ -129,51 +468,90 @@ class TaskCommander:
             execution_data = {'exception': e}
         return execution_data
 
-    def _run_container(self, task: TaskInterface, params: Dict[str, Any]) -> Container:
+    def _is_resident(self, task: TaskInterface) -> bool:
+        """Resident workers are opt-in per task dict ('resident': True) and only apply to interval tasks."""
+        task_dict = self.task_dicts.get(task.name(), {})
+        return bool(task_dict.get('resident', False)) and task.interval() is not None
+
+    def _run_resident(self, task: TaskInterface, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Send the run to the task's warm container; completion is collected like a containerless worker."""
+        try:
+            self._ensure_resident_container(task, params)
+        except Exception as e:
+            self._print(f"'{task.name()}' resident worker error: {e.__str__()}")
+            return {'exception': e}
+        worker = self._submit_worker(self._request_resident_run, task, params)
+        return {
+            'worker': worker,
+            'task_name': task.name()
+        }
+
+    def _ensure_resident_container(self, task: TaskInterface, params: Dict[str, Any]) -> None:
+        """Start the warm container, or restart it if it stopped or this run needs other volumes or ports."""
+        task_name = task.name()
+        commander_dir = os.path.dirname(os.path.abspath(__file__))
+        mounts = (self.container_builder.get_volumes(commander_dir, task, params), task.ports(params))
+        container = self.resident_containers.get(task_name)
+        if container is not None:
+            try:
+                container.reload()
+                if container.status == 'running' and self.resident_mounts.get(task_name) == mounts:
+                    return
+                container.remove(force=True)
+            except Exception as e:
+                self._print(f"[docker] Warning: Could not reuse resident container {container.short_id}: {e}")
+            del self.resident_containers[task_name]
+        container = self._run_container(task, params, self.container_builder.get_resident_cmd(task))
+        self.resident_containers[task_name] = container
+        self.resident_mounts[task_name] = mounts
+        if self._cfg['print_docker_container_lifecycle']:
+            self._print(f"'{task_name}' resident worker started in container {container.short_id}")
+
+    def _request_resident_run(self, task: TaskInterface, params: Dict[str, Any]) -> int:
+        commander_dir = os.path.dirname(os.path.abspath(__file__))
+        socket_path = ResidentWorker.get_socket_path(f"{commander_dir}/tmp/tasks/{task.name()}")
+        reply = ResidentWorker.request(socket_path, params, self.RESIDENT_CONNECT_TIMEOUT)
+        if reply.get('status') != 'done':
+            raise RuntimeError(reply.get('error', 'resident worker failed'))
+        return 0 if reply.get('success', True) else 1
+
+    def _run_container(self, task: TaskInterface, params: Dict[str, Any], command: List[str] | None = None) -> Container:
         DONT_BLOCK_CONSOLE = True
         KILL_CONTAINER_AFTER_FINISH = False
         commander_dir = os.path.dirname(os.path.abspath(__file__))
         os.makedirs(f"{commander_dir}/tmp/tasks", exist_ok=True)
-        client = docker.from_env()
+        client = self.docker_client.get()
         task_name = task.name()
-        image_tag = f"task-commander:{task_name}"
-        image_exists = self.container_builder.does_task_dockerfile_exist(client, commander_dir, task_name, image_tag)
-        if not image_exists:
-            dockerfile_template_path = f"{commander_dir}/container/Dockerfile"
-            path_task_dir = f"{commander_dir}/tmp/tasks/{task_name}"
-            os.makedirs(path_task_dir, exist_ok=True)
-            os.makedirs(f"{path_task_dir}/container", exist_ok=True)
-            self.container_builder.create_task_dockerfile(task, path_task_dir, dockerfile_template_path)
-            if self._cfg['print_docker_container_lifecycle']:
-                self._print(f"Building Docker image '{image_tag}' from {path_task_dir}")
-            try:
-                image, build_logs = client.images.build(
-                    path = path_task_dir,
-                    tag = image_tag,
-                    rm = True,  # Remove intermediate containers
-                    forcerm = True  # Always remove intermediate containers
-                )
-                if self._cfg['print_docker_container_lifecycle']:
-                    self._print(f"Successfully built image {image.short_id}")
-            except Exception as e:
-                self._print(f"Failed to build Docker image: {e}")
-                raise
+        image_tag = self._build_image(client, task)
         task_ports = task.ports(params)
         container = client.containers.run(
             image = image_tag,
-            command = self.container_builder.get_container_cmd(task, params),
+            command = command or self.container_builder.get_container_cmd(task, params),
             detach = DONT_BLOCK_CONSOLE,
             remove = KILL_CONTAINER_AFTER_FINISH,
             working_dir = f"/app/tmp/tasks/{task_name}/container",
             volumes = self.container_builder.get_volumes(commander_dir, task, params),
             ports = task_ports,
-            environment = {"PARAMS": json.dumps(params)},
             mem_limit = self.container_builder.get_memory(task.memory_gb()),
             nano_cpus = self.container_builder.get_cpus(task.cpus()),
-            network_mode = self.container_builder.get_network_mode(task)
+            network_mode = self.container_builder.get_network_mode(task),
+            labels = self.container_builder.get_labels(task)
         )
         return container
 
+    def _build_image(self, client: docker.DockerClient, task: TaskInterface) -> str:
+        """Render the task Dockerfile and build its image unless one with the same build hash exists."""
+        commander_dir = os.path.dirname(os.path.abspath(__file__))
+        try:
+            return self.container_builder.build_image(client, task, commander_dir, self._print_lifecycle)
+        except Exception as e:
+            self._print(f"Failed to build Docker image: {e}")
+            raise
+
+    def _print_lifecycle(self, message: str) -> None:
+        if self._cfg['print_docker_container_lifecycle']:
+            self._print(message)
+
     def _should_run_task(self, task: TaskInterface) -> bool:
         task_name = task.name()
         interval = task.interval()
@@ -183,52 +561,339 @@ class TaskCommander:
                 return task_name not in self.running_containers
             else:
                 return task_name not in self.last_execution
+        if task_name in self.running_workers or task_name in self.shard_runs or task_name in self.remote_runs:
+            return False
+        if task_name in self.due_overrides:
+            return time.time() >= self.due_overrides[task_name]
         if task_name not in self.last_execution:
             return True
         time_elapsed = time.time() - self.last_execution[task_name]
         return time_elapsed >= interval
 
     def _handle_finished_tasks(self) -> Dict[str, dict]:
+        tasks_output = self._handle_finished_containers()
+        tasks_output.update(self._handle_finished_workers())
+        tasks_output.update(self._handle_finished_remote())
+        return tasks_output
+
+    def _handle_finished_remote(self) -> Dict[str, dict]:
+        """Store the outputs reported by worker agents as if the runs had written them locally."""
+        remote_output = {}
+        if self.agent_registry is None:
+            return remote_output
+        for run_key, exit_code, output in self.agent_registry.pop_finished():
+            agent_id = self.remote_runs.pop(run_key, None)
+            if agent_id is None:
+                continue
+            self.agent_registry.release(run_key)
+            task_output = None
+            if output is not None:
+                self.output_parser.save(run_key, output['data'], output['text'], output['html'])
+                task_output = self._get_run_output(run_key)
+            else:
+                self._print(f"[agent] Lost agent '{agent_id}' while running '{run_key}'")
+            if self._cfg['print_cycles']:
+                self._print(f"[agent] Task finished on '{agent_id}': {run_key}, exit code: {exit_code}")
+            self._complete_run(run_key, exit_code, task_output, remote_output)
+        return remote_output
+
+    def _handle_finished_workers(self) -> Dict[str, dict]:
+        workers_output = {}
+        completed_workers = {
+            task_name: worker
+            for task_name, worker in self.running_workers.items()
+            if worker.done()
+        }
+        for run_key, worker in completed_workers.items():
+            del self.running_workers[run_key]
+            self.admission_controller.release(run_key)
+            exit_code = None
+            task_output = None
+            try:
+                exit_code = worker.result()
+                task_output = self._get_run_output(run_key)
+                if self._cfg['print_cycles']:
+                    self._print(f"[worker] Task finished: {run_key}, exit code: {exit_code}")
+            except Exception as e:
+                self._print(f"[worker] Error running task '{run_key}': {e}")
+            self._complete_run(run_key, exit_code, task_output, workers_output)
+        return workers_output
+
+    def _handle_finished_containers(self) -> Dict[str, dict]:
         containers_output = {}
         completed_containers = self._get_finished_containers()
-        for task_name, container in completed_containers.items():
+        for run_key, container in completed_containers.items():
+            exit_code = None
+            task_output = None
             try:
                 logs = container.logs() \
                     .decode(errors="replace") \
                     .strip()
                 exit_code = container.attrs['State']['ExitCode']
-                output_txt = self.output_parser.get_text(task_name)
-                output_data = self.output_parser.get_json(task_name)
-                output_html = self.output_parser.get_html(task_name)
-                containers_output[task_name] = {
-                    'text': output_txt,
-                    'html': output_html,
-                    'data': output_data
-                }
-                self._print(f"[{task_name}] output: {output_txt}")
+                task_output = self._get_run_output(run_key)
                 if self._cfg['print_docker_container_logs']:
-                    self._print(f"[{task_name}] logs: \"{logs}\"")
+                    self._print(f"[{run_key}] logs: \"{logs}\"")
                 if self._cfg['print_docker_container_lifecycle']:
-                    self._print(f"[docker] Container finished: {container.short_id} ({task_name}), exit code: {exit_code}")
-                self._finish_container(task_name, container)
-                if task_name in self.task_registry:
-                    task = self.task_registry[task_name]
-                    if task.revive():
-                        self._enqueue_task(task_name)
-                        if self._cfg['print_docker_container_lifecycle']:
-                            self._print(f"[docker] Task '{task_name}' will be revived in next cycle")
+                    self._print(f"[docker] Container finished: {container.short_id} ({run_key}), exit code: {exit_code}")
             except Exception as e:
                 self._print(f"[docker] Error checking container {container.short_id}: {e}")
-                self._finish_container(task_name, container)
+            self._finish_container(run_key, container)
+            self._complete_run(run_key, exit_code, task_output, containers_output)
         return containers_output
 
-    # Reset last_execution to allow immediate re-run in next cycle
-    def _enqueue_task(self, task_name: str) -> None:
-        """ Reset last_execution to allow immediate re-run in next cycle """
+    def _complete_run(self, run_key: str, exit_code: int | None, task_output: Dict[str, Any] | None, tasks_output: Dict[str, dict]) -> None:
+        """Complete the task of a finished run; a sharded task completes with its last shard."""
+        self.run_deadlines.pop(run_key, None)
+        self.queued_deadlines.pop(run_key, None)
+        self.worker_starts.pop(run_key, None)
+        is_timed_out = run_key in self.timed_out_runs
+        if is_timed_out:
+            self.timed_out_runs.discard(run_key)
+            task_output = self._save_timeout_output(run_key)
+        if task_output is not None:
+            self._print(f"[{run_key}] output: {task_output['text']}")
+        if run_key not in self.shard_owners:
+            if task_output is not None:
+                tasks_output[run_key] = task_output
+            self._finish_task(run_key, exit_code, task_output, is_timed_out)
+            return
+        task_name, index = self.shard_owners.pop(run_key)
+        shard_run = self.shard_runs[task_name]
+        shard_run['pending'].discard(run_key)
+        shard_run['timed_out'] = shard_run.get('timed_out', False) or is_timed_out
+        if task_output is not None and task_output['data']:
+            shard_run['outputs'][index] = task_output['data']
+        if exit_code != 0:
+            shard_run['exit_code'] = exit_code
+        self.output_parser.remove(run_key)
+        if shard_run['pending']:
+            return
+        del self.shard_runs[task_name]
+        self.admission_controller.release(task_name)
+        task_output = self._merge_shard_outputs(task_name, shard_run['outputs'])
+        if task_output is not None:
+            tasks_output[task_name] = task_output
+        self._finish_task(task_name, shard_run['exit_code'], task_output, shard_run['timed_out'])
+
+    def _get_run_output(self, run_key: str) -> Dict[str, Any] | None:
+        """Output of a finished run; a timed out run gets its timeout result from _complete_run instead."""
+        if run_key in self.timed_out_runs:
+            return None
+        return self._get_task_output(run_key)
+
+    def _save_timeout_output(self, run_key: str) -> Dict[str, Any]:
+        """Replace the output of a killed run, which the run never got to write, with a timeout result."""
+        task_name = self.shard_owners.get(run_key, (run_key,))[0]
+        task = self.task_registry[task_name]
+        message = f"timeout: run exceeded max time expected of {task.max_time_expected()} secs"
+        data = {
+            'error': message,
+            'timed_out': True,
+            'time_elapsed_ms': task.max_time_expected() * 1000.0,
+            'time_finish_ms': time.time() * 1000.0,
+            'html_template': task.html_template(),
+            'attempt': self.attempts.get(task_name, 1),
+        }
+        self.output_parser.save(run_key, data, message, f"<p>{html.escape(message)}</p>")
+        return self._get_task_output(run_key)
+
+    def _merge_shard_outputs(self, task_name: str, outputs: Dict[int, Dict[str, Any]]) -> Dict[str, Any] | None:
+        """Merge shard outputs into the single {task}.json/.txt/.html the UI reads."""
+        task = self.task_registry[task_name]
+        shard_outputs = [outputs[index] for index in sorted(outputs)]
+        try:
+            data = task.merge(shard_outputs)
+            data['time_elapsed_ms'] = max((output.get('time_elapsed_ms', 0) for output in shard_outputs), default=0)
+            data['time_finish_ms'] = time.time() * 1000.0
+            data['html_template'] = task.html_template()
+            data['shards'] = len(shard_outputs)
+            data['attempt'] = self.attempts.get(task_name, 1)
+            self.output_parser.save(task_name, data, task.text_output(data), task.html_output(data))
+        except Exception as e:
+            self._print(f"'{task_name}' could not merge shard outputs: {e}")
+            return None
+        task_output = self._get_task_output(task_name)
+        self._print(f"[{task_name}] output: {task_output['text']}")
+        return task_output
+
+    def _finish_task(self, task_name: str, exit_code: int | None, task_output: Dict[str, Any] | None, is_timed_out: bool = False) -> None:
+        self.state_store.record_finish(task_name, time.time(), exit_code)
+        if task_name not in self.task_registry:
+            return
+        task = self.task_registry[task_name]
+        self._schedule_next(task)
+        is_failed = self._is_failed_run(exit_code, task_output, is_timed_out)
+        if is_failed and self._schedule_retry(task):
+            return
+        self.attempts.pop(task_name, None)
+        if is_timed_out:
+            self._schedule_timeout_backoff(task)
+            return
+        self.timeout_counts.pop(task_name, None)
+        if task.revive():
+            self._enqueue_task(task_name, self.KEEP_ALIVE_RETRY_DELAY)
+            if self._cfg['print_cycles']:
+                self._print(f"Task '{task_name}' will be revived in next cycle")
+        self._on_task_finished(task_name, is_failed, task_output)
+
+    def _is_failed_run(self, exit_code: int | None, task_output: Dict[str, Any] | None, is_timed_out: bool) -> bool:
+        """A run failed if it timed out, exited non-zero or reported an 'error' in its output."""
+        return is_timed_out \
+            or exit_code != 0 \
+            or task_output is None \
+            or 'error' in task_output['data']
+
+    def _schedule_retry(self, task: TaskInterface) -> bool:
+        """
+        Schedule the next attempt of a failed run according to task.retry_policy(): exponential
+        backoff from base_delay with +/- jitter, never later than the regular interval.
+        Return False if the task has no attempts left or is not an interval task.
+        """
+        task_name = task.name()
+        policy = task.retry_policy()
+        max_attempts = int(policy.get('max_attempts', 1))
+        attempt = self.attempts.get(task_name, 1)
+        if task.interval() is None or attempt >= max_attempts:
+            return False
+        self.attempts[task_name] = attempt + 1
+        jitter = float(policy.get('jitter', 0.0))
+        delay = float(policy.get('base_delay', 0.0)) * 2 ** (attempt - 1)
+        delay = min(delay * random.uniform(1.0 - jitter, 1.0 + jitter), task.interval())
+        self.due_overrides[task_name] = time.time() + delay
+        self._schedule_next(task)
+        self._print(f"Task '{task_name}' failed on attempt {attempt}/{max_attempts}, retrying in {delay:.1f} secs")
+        return True
+
+    def _schedule_timeout_backoff(self, task: TaskInterface) -> None:
+        """Retry a timed out task after an exponential backoff, never later than its regular interval."""
+        task_name = task.name()
+        self.timeout_counts[task_name] = self.timeout_counts.get(task_name, 0) + 1
+        backoff = self.TIMEOUT_BACKOFF_BASE * 2 ** (self.timeout_counts[task_name] - 1)
+        backoff = min(backoff, self.TIMEOUT_BACKOFF_MAX, task.interval())
+        self.due_overrides[task_name] = time.time() + backoff
+        self._schedule_next(task)
+        self._print(f"Task '{task_name}' timed out {self.timeout_counts[task_name]} time(s) in a row, retrying in {backoff:.0f} secs")
+
+    def _on_task_finished(self, task_name: str, is_failed: bool, task_output: Dict[str, Any] | None) -> None:
+        """
+        Hand a successful output to downstream tasks and trigger them right away. A downstream
+        task that is still running keeps the output and is triggered again once it finishes.
+        """
+        if not is_failed and task_output['data']:
+            for downstream_name in self.downstream_tasks.get(task_name, []):
+                self.upstream_outputs.setdefault(downstream_name, {})[task_name] = task_output['data']
+                if not self._is_running(downstream_name):
+                    self._trigger_task(downstream_name, task_name)
+        if task_name in self.upstream_outputs:
+            self._trigger_task(task_name, ", ".join(self.upstream_outputs[task_name]))
+
+    def _trigger_task(self, task_name: str, upstream_names: str) -> None:
+        self._enqueue_task(task_name)
+        if self._cfg['print_cycles']:
+            self._print(f"Task '{task_name}' triggered by upstream '{upstream_names}'")
+
+    def _is_running(self, task_name: str) -> bool:
+        return task_name in self.running_containers \
+            or task_name in self.running_workers \
+            or task_name in self.shard_runs \
+            or task_name in self.remote_runs \
+            or self.admission_controller.is_waiting(task_name)
+
+    def _enqueue_task(self, task_name: str, delay: float = 0.0) -> None:
+        """ Reset last_execution and schedule a re-run in delay seconds """
         if task_name in self.last_execution:
             del self.last_execution[task_name]
+        self.due_overrides.pop(task_name, None)
+        if delay > 0:
+            self.due_overrides[task_name] = time.time() + delay
+        if task_name in self.task_registry:
+            self._schedule_next(self.task_registry[task_name])
+
+    def _schedule_next(self, task: TaskInterface) -> None:
+        """Push the next due time of a task into the scheduler."""
+        task_name = task.name()
+        interval = task.interval()
+        if interval is not None:
+            last_execution = self.last_execution.get(task_name)
+            due_time = time.time() \
+                if last_execution is None else \
+                last_execution + interval + self.run_jitters.get(task_name, 0.0)
+            self.scheduler.schedule(task_name, self.due_overrides.get(task_name, due_time))
+        elif task_name in self.due_overrides:
+            self.scheduler.schedule(task_name, self.due_overrides[task_name])
+        elif not self._cfg['run_containerless'] and task_name not in self.running_containers:
+            self.scheduler.schedule(task_name, time.time() + self.KEEP_ALIVE_RETRY_DELAY)
+
+    def _get_max_wait(self) -> float | None:
+        """
+        Wake up for the next run deadline and to notice lost agents; without a docker events
+        stream, running containers are also polled.
+        """
+        max_wait = None
+        if self.running_containers and not self._is_event_listener_alive():
+            max_wait = self.CONTAINER_POLL_INTERVAL
+        if self.remote_runs:
+            max_wait = AgentRegistry.HEARTBEAT_TIMEOUT if max_wait is None else min(max_wait, AgentRegistry.HEARTBEAT_TIMEOUT)
+        if self.run_deadlines:
+            deadline_wait = max(0.0, min(self.run_deadlines.values()) - time.time())
+            max_wait = deadline_wait if max_wait is None else min(max_wait, deadline_wait)
+        return max_wait
+
+    def _start_event_listener(self) -> None:
+        if self._cfg['run_containerless']:
+            return
+        try:
+            self.event_listener = EventListener(self.docker_client.get(), self._on_container_event)
+            self.event_listener.start()
+        except Exception as e:
+            self.event_listener = None
+            self._print(f"[docker] Warning: Could not subscribe to docker events, polling containers instead: {e}")
+
+    def _is_event_listener_alive(self) -> bool:
+        """Once the events stream ends, report why and fall back to polling for good."""
+        if self.event_listener is not None and not self.event_listener.is_alive():
+            reason = self.event_listener.error if self.event_listener.error is not None else "stream closed"
+            self._print(f"[docker] Warning: Lost the docker events stream, polling containers instead: {reason}")
+            self.event_listener = None
+        return self.event_listener is not None
+
+    def _on_container_event(self, container_id: str, action: str, exit_code: int | None) -> None:
+        """Called from the events thread: record the event and wake up the loop."""
+        with self._events_lock:
+            event = self.container_events.setdefault(container_id, {'oom': False})
+            event['time'] = time.time()
+            if action == 'oom':
+                event['oom'] = True
+            elif action == 'die':
+                event['exit_code'] = exit_code
+        self.scheduler.notify()
 
     def _get_finished_containers(self) -> Dict[str, Container]:
+        if not self._is_event_listener_alive():
+            return self._poll_finished_containers()
+        completed_containers = {}
+        with self._events_lock:
+            for task_name, container in self.running_containers.items():
+                event = self.container_events.get(container.id)
+                if event is not None and 'exit_code' in event:
+                    completed_containers[task_name] = container
+                    del self.container_events[container.id]
+                    if event['oom']:
+                        self._print(f"[docker] Container {container.short_id} ({task_name}) ran out of memory")
+            expired_ids = [
+                container_id for container_id, event in self.container_events.items()
+                if time.time() - event['time'] > self.CONTAINER_EVENT_RETENTION
+            ]
+            for container_id in expired_ids:
+                del self.container_events[container_id]
+        for task_name, container in completed_containers.items():
+            try:
+                container.reload()
+            except Exception as e:
+                self._print(f"[docker] Warning: Could not reload container {container.short_id}: {e}")
+        return completed_containers
+
+    def _poll_finished_containers(self) -> Dict[str, Container]:
         completed_containers = {}
         for task_name, container in self.running_containers.items():
             try:
@@ -248,6 +913,8 @@ class TaskCommander:
         finally:
             if task_name in self.running_containers:
                 del self.running_containers[task_name]
+            self.admission_controller.release(task_name)
+            self.state_store.remove_running_container(task_name)
 
     def _print(self, message: str) -> None:
         timestamp = time.time()
@@ -265,6 +932,105 @@ class TaskCommander:
         for task_dict in tasks:
             task = task_dict['task']
             self.task_registry[task.name()] = task
+            self.task_dicts[task.name()] = task_dict
+        for task_name, task in self.task_registry.items():
+            for upstream_name in task.depends_on():
+                if upstream_name not in self.task_registry:
+                    self._print(f"Warning: task '{task_name}' depends on unregistered task '{upstream_name}'")
+                    continue
+                self.downstream_tasks.setdefault(upstream_name, []).append(task_name)
+        worker_tasks = tasks \
+            if self._cfg['run_containerless'] else \
+            [task_dict for task_dict in tasks if self._is_resident(task_dict['task'])]
+        if worker_tasks:
+            self.worker_pool = ThreadPoolExecutor(
+                max_workers = self._get_worker_pool_size(worker_tasks),
+                thread_name_prefix = "task-worker"
+            )
+
+    def _prebuild_images(self) -> None:
+        """
+        Build the images of all tasks concurrently in container mode. A task is not submitted
+        until its image is ready, so fast tasks do not wait behind heavy builds.
+        """
+        if self._cfg['run_containerless']:
+            return
+        try:
+            client = self.docker_client.get()
+        except Exception as e:
+            self._print(f"[docker] Warning: Could not prebuild images, building them on first run: {e}")
+            return
+        self.build_pool = ThreadPoolExecutor(
+            max_workers = self._cfg['image_build_parallelism'],
+            thread_name_prefix = "image-build"
+        )
+        for task_name, task in self.task_registry.items():
+            build = self.build_pool.submit(self._build_image, client, task)
+            build.add_done_callback(lambda _: self.scheduler.notify())
+            self.image_builds[task_name] = build
+
+    def _handle_finished_builds(self) -> None:
+        """Make tasks whose image build finished runnable again."""
+        for task_name, build in list(self.image_builds.items()):
+            if not build.done():
+                continue
+            del self.image_builds[task_name]
+            try:
+                build.result()
+                self._print_lifecycle(f"Image for '{task_name}' is ready")
+            except Exception as e:
+                self._print(f"[docker] Prebuild for '{task_name}' failed, building it on first run: {e}")
+            self._schedule_next(self.task_registry[task_name])
+
+    def _restore_state(self) -> None:
+        """Resume interval schedules from the last start times recorded by a previous run."""
+        for task_name, last_start in self.state_store.get_last_starts().items():
+            task = self.task_registry.get(task_name)
+            if task is not None and task.interval() is not None:
+                self.last_execution[task_name] = last_start
+
+    def _schedule_registered_tasks(self) -> None:
+        """
+        Initial schedule: keep-alive tasks are due now and the rest at their next interval.
+        Never-run and overdue tasks that share an interval are spread evenly over it instead
+        of all firing now, in task order, so their later runs do not line up either.
+        """
+        now = time.time()
+        due_now = {}
+        for task_name, task in self.task_registry.items():
+            if task_name in self.running_containers:
+                continue
+            interval = task.interval()
+            last_execution = self.last_execution.get(task_name)
+            if interval is None:
+                self.scheduler.schedule(task_name, now)
+            elif last_execution is None or last_execution + interval <= now:
+                due_now.setdefault(interval, []).append(task_name)
+            else:
+                self.scheduler.schedule(task_name, last_execution + interval)
+        for interval, task_names in due_now.items():
+            task_names.sort(key=lambda name: self.task_dicts[name].get('order', 0))
+            for index, task_name in enumerate(task_names):
+                phase = interval * index / len(task_names)
+                self.due_overrides[task_name] = now + phase
+                self.scheduler.schedule(task_name, now + phase)
+
+    def _get_state_db_path(self) -> str:
+        commander_dir = os.path.dirname(os.path.abspath(__file__))
+        return f"{commander_dir}/tmp/{StateStore.FILE_NAME}"
+
+    def _get_worker_pool_size(self, tasks: List[dict]) -> int:
+        """
+        One worker per keep-alive task, whose run never returns, plus one per CPU declared by
+        interval tasks, never more than one per interval run (task or shard) since a run
+        never overlaps itself.
+        """
+        keep_alive_runs = sum(1 for task_dict in tasks if task_dict['task'].interval() is None)
+        interval_tasks = [task_dict['task'] for task_dict in tasks if task_dict['task'].interval() is not None]
+        runs = sum(self._get_shard_count(task) for task in interval_tasks)
+        cpus = sum(task.cpus() * self._get_shard_count(task) for task in interval_tasks)
+        interval_workers = max(1, min(runs, math.ceil(cpus))) if interval_tasks else 0
+        return max(1, keep_alive_runs + interval_workers)
 
     def _save_tasks_config(self, tasks: List[dict]) -> None:
         """Save tasks configuration to a JSON file for UI server."""
@@ -274,32 +1040,101 @@ class TaskCommander:
             'name': task_dict['task'].name(),
             'order': task_dict['order']
         } for task_dict in tasks]
+        tasks_config.append({
+            'name': self.status_reporter.NAME,
+            'order': self.status_reporter.ORDER
+        })
         tasks_config = sorted(tasks_config, key=lambda x: x['order'])
         os.makedirs(os.path.dirname(config_path), exist_ok=True)
         with open(config_path, 'w', encoding='utf-8') as f:
             json.dump(tasks_config, f, indent=2)
 
+    def _save_status(self) -> None:
+        """Write scheduler state (admission reservations and ready queue) for the UI."""
+        try:
+            self.status_reporter.save(self.admission_controller.state())
+        except Exception as e:
+            self._print(f"Warning: Could not save commander status: {e}")
+
     def _signal_handler(self, signal: int, frame: Optional[FrameType]) -> None:
         self._print(f"interrupt signal detected. Closing...")
         self._cleanup_running()
         sys.exit(0)
 
     def _cleanup_orphaned(self) -> None:
-        """Cleanup orphaned containers from previous runs."""
+        """Re-adopt containers still running from a previous run and cleanup the other orphans."""
         try:
-            cleaned_ids = self.cleaner.cleanup_orphaned_containers()
+            adopted_ids = self._adopt_running_containers()
+            cleaned_ids = self.cleaner.cleanup_orphaned_containers(adopted_ids)
             if cleaned_ids:
                 cleaned_ids_str = ", ".join(cleaned_ids)
                 self._print(f"Found {len(cleaned_ids)} orphaned container(s) from previous run:\n  {cleaned_ids_str}")
         except Exception as e:
             self._print(f"[docker] Warning: Could not check for orphaned containers: {e}")
 
+    def _adopt_running_containers(self) -> List[str]:
+        """Track in-flight containers recorded by a previous commander as if this run had started them."""
+        if self._cfg['run_containerless']:
+            return []
+        client = self.docker_client.get()
+        adopted_ids = []
+        for task_name, container_id in self.state_store.get_running_containers().items():
+            task = self.task_registry.get(task_name)
+            try:
+                container = client.containers.get(container_id)
+                is_running = container.status == 'running'
+            except DockerException:
+                is_running = False
+            if task is None or not is_running:
+                self.state_store.remove_running_container(task_name)
+                continue
+            self.running_containers[task_name] = container
+            self.admission_controller.reserve(task_name, task.cpus(), task.memory_gb(), task.interval() is not None)
+            adopted_ids.append(container.id)
+            self._print(f"[docker] Re-adopted running container {container.short_id} ({task_name})")
+        return adopted_ids
+
     def _cleanup_running(self) -> None:
-        """Cleanup currently running containers."""
+        """Cleanup currently running containers, containerless workers and remote runs."""
+        self._cleanup_workers()
+        self._cleanup_remote_runs()
+        if self.event_listener is not None:
+            self.event_listener.stop()
+        if self.leadership_lost.is_set():
+            self._print("[docker] Leaving running containers to the new scheduler lease holder")
+            self.docker_client.close()
+            return
         try:
             cleaned_ids = self.cleaner.cleanup_containers(self.running_containers)
+            cleaned_ids += self.cleaner.cleanup_containers(self.resident_containers)
             if cleaned_ids:
                 self._print(f"Cleaning up {len(cleaned_ids)} running container(s)...")
                 self._print("Cleanup complete")
         except Exception as e:
             self._print(f"[docker] Warning: Could not cleanup containers: {e}")
+        self.docker_client.close()
+        if self.leader_lease is not None:
+            self.lease_renewal_stop.set()
+            self.leader_lease.release()
+
+    def _cleanup_remote_runs(self) -> None:
+        if self.agent_registry is None:
+            return
+        for run_key, agent_id in list(self.remote_runs.items()):
+            try:
+                self.agent_registry.stop_run(agent_id, run_key)
+            except Exception as e:
+                self._print(f"[agent] Warning: Could not stop '{run_key}' on agent '{agent_id}': {e}")
+        self.agent_registry.stop()
+
+    def _cleanup_workers(self) -> None:
+        """Terminate containerless worker processes and stop the worker and image build pools."""
+        for task_name, process in list(self.worker_processes.items()):
+            try:
+                process.terminate()
+            except Exception as e:
+                self._print(f"[worker] Warning: Could not terminate '{task_name}': {e}")
+        if self.worker_pool:
+            self.worker_pool.shutdown(wait=False, cancel_futures=True)
+        if self.build_pool:
+            self.build_pool.shutdown(wait=False, cancel_futures=True)
@@ -1,9 +1,11 @@
+from container.ResidentWorker import ResidentWorker
 from task.TaskInterface import TaskInterface
 from typing import Any, Dict, Tuple
 import argparse
 import importlib
 import json
 import os
+import sys
 import time
 
 TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
@@ -13,10 +15,13 @@ class TaskLauncher:
         self._task = task
         self._logs = {}
         self._time_elapsed_ms = 0
+        self._output_name = task.name()
 
-    def run(self, params: Dict[str, Any]) -> None:
+    def run(self, params: Dict[str, Any]) -> bool:
+        """Run the task and write its outputs. Return False if the run raised or reported an 'error'."""
         try:
             output_path = params['outdir']
+            self._output_name = params.get('shard', {}).get('output_name', self._task.name())
             self._create_dirs(output_path)
             self._log(f"executing - params: {params}")
             time_start = time.perf_counter()
@@ -29,16 +34,19 @@ class TaskLauncher:
             output['time_elapsed_ms'] = self._time_elapsed_ms
             output['time_finish_ms'] = time.time() * 1000.0
             output['html_template'] = html_template
-            if (self._task.max_time_expected() is not None) and (self._time_elapsed_ms > self._task.max_time_expected()):
-                self._log(f"task took too long: {self._time_elapsed_ms} secs.")
+            output['attempt'] = params.get('attempt', 1)
+            if (self._task.max_time_expected() is not None) and (self._time_elapsed_ms > self._task.max_time_expected() * 1000.0):
+                self._log(f"task took too long: {self._time_elapsed_ms / 1000.0:.2f} secs.")
             self._write_container_logs(output_path, output)
             self._write_task_output(output_path, text_output)
             self._write_task_html_output(output_path, html_output)
             self._write_task_output_json(output_path, output)
+            return 'error' not in output
         except PermissionError as e:
             self._log(f"permission error: {e}")
         except Exception as e:
             self._log(f"unhandled exception: {e}")
+        return False
 
     def elapsed_time(self) -> float:
         return self._time_elapsed_ms
@@ -69,17 +77,17 @@ class TaskLauncher:
             f.write(json_str + "\n")
 
     def _write_task_output(self, output_path: str, text_output: str) -> None:
-        txt_path = os.path.join(output_path, "output", f"{self._task.name()}.txt")
+        txt_path = os.path.join(output_path, "output", f"{self._output_name}.txt")
         with open(txt_path, "w", encoding="utf-8") as f:
             f.write(text_output)
 
     def _write_task_html_output(self, output_path: str, html_output: str) -> None:
-        html_path = os.path.join(output_path, "output", f"{self._task.name()}.html")
+        html_path = os.path.join(output_path, "output", f"{self._output_name}.html")
         with open(html_path, "w", encoding="utf-8") as f:
             f.write(html_output)
 
     def _write_task_output_json(self, output_path: str, output: Dict[str, Any]) -> None:
-        json_path = os.path.join(output_path, "output", f"{self._task.name()}.json")
+        json_path = os.path.join(output_path, "output", f"{self._output_name}.json")
         with open(json_path, "w", encoding="utf-8") as f:
             json.dump(output, f, ensure_ascii=False, indent=2)
 
@@ -87,7 +95,10 @@ def _get_args() -> argparse.Namespace:
     p = argparse.ArgumentParser()
     p.add_argument("--outdir", required=True, help="Output dir inside container")
     p.add_argument("--task", required=True, help="Module path of the task to run")
-    p.add_argument("--data", required=True, help="JSON config")
+    p.add_argument("--data", default="{}", help="JSON config")
+    p.add_argument("--params-file", help="Path of a JSON config file, used instead of --data")
+    p.add_argument("--serve", help="Unix socket path: keep running and execute one run per request")
+    p.add_argument("--serve-owner", help="uid:gid that owns the --serve socket, the commander's user")
     args = p.parse_args()
     return args
 
@@ -97,11 +108,24 @@ def _load_params() -> Tuple[TaskInterface, Dict[str, Any]]:
     class_name = args.task.split('.')[-1]
     task_class = getattr(module, class_name)
     task = task_class()
-    params = json.loads(args.data)
+    if args.params_file:
+        with open(args.params_file, 'r', encoding='utf-8') as f:
+            params = json.load(f)
+    else:
+        params = json.loads(args.data)
     params.update({'args': args})
     return task, params
 
+def _serve_run(task: TaskInterface, params: Dict[str, Any]) -> Dict[str, Any]:
+    launcher = TaskLauncher(task)
+    success = launcher.run(params)
+    return {'time_elapsed_ms': launcher.elapsed_time(), 'success': success}
+
 if __name__ == "__main__":
     task, params = _load_params()
-    launcher = TaskLauncher(task)
-    launcher.run(params)
+    if params['args'].serve:
+        owner = tuple(int(part) for part in params['args'].serve_owner.split(':')) if params['args'].serve_owner else None
+        ResidentWorker.serve(params['args'].serve, lambda run_params: _serve_run(task, run_params), owner)
+    else:
+        launcher = TaskLauncher(task)
+        sys.exit(0 if launcher.run(params) else 1)
@@ -1,9 +1,14 @@
+from container.PipCache import PipCache
+from container.ResidentWorker import ResidentWorker
 from docker.client import DockerClient
 from task.TaskInterface import TaskInterface
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List
 import docker
+import hashlib
 import json
 import os
+import re
+import threading
 
 OUTPUT_DIR = "tmp"
 
@@ -11,7 +16,36 @@ class Builder:
     TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
     PYTHON_IMAGE = "python:3.12-slim"
     VERSION = 0.1
-    FORCE_REBUILD = True
+    BUILD_HASH_LABEL = "task-commander.build-hash"
+    CONTAINER_LABEL = "task-commander"
+    ROLE_LABEL = "task-commander.role"
+    COMMANDER_ROLE = "commander"
+    AGENT_ROLE = "agent"
+    MEDIA_BASE_IMAGE = "task-commander-base:media"
+    MEDIA_APT_PACKAGES = ["ffmpeg"]
+    MEDIA_PIP_PACKAGES = [
+        "numpy==1.26.4",
+        "opencv-python-headless==4.9.0.80",
+        "Pillow",
+    ]
+
+    PIP_CACHE_DIR = "var/pip_cache"
+    IMAGE_CMD = ["python", "--version"]
+    SAFE_NAME_PATTERN = re.compile(r"[\w.-]+")
+
+    @staticmethod
+    def is_safe_name(name: Any) -> bool:
+        """Run keys and shard output names become file names, so they cannot contain path separators."""
+        return isinstance(name, str) and Builder.SAFE_NAME_PATTERN.fullmatch(name) is not None and ".." not in name
+
+    def __init__(self, force_rebuild: bool = False, pip_cache_max_gb: float = PipCache.DEFAULT_MAX_GB, role: str = COMMANDER_ROLE) -> None:
+        self._force_rebuild = force_rebuild
+        self._role = role
+        self._built_tags = set()
+        self._base_lock = threading.Lock()
+        self._pip_cache_lock = threading.Lock()
+        commander_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+        self._pip_cache = PipCache(os.path.join(commander_dir, self.PIP_CACHE_DIR), pip_cache_max_gb)
 
     def create_task_dockerfile(self, task: TaskInterface, task_output_dir: str, dockerfile_template_path: str) -> None:
         if not os.path.exists(dockerfile_template_path):
@@ -19,22 +53,13 @@ class Builder:
         with open(dockerfile_template_path, 'r') as f:
             template_content = f.read()
         apt_packages = task.dependencies().get('other', [])
+        pip_packages = task.dependencies().get('pip', [])
         env_vars = task.dependencies().get('env', [])
-        if apt_packages:
-            apt_install_lines = []
-            for pkg in apt_packages:
-                apt_install_lines.append(f"    {pkg}")
-            apt_install_str = " \\\n".join(apt_install_lines)
-            apt_block = "\n".join([
-                "# Install task-specific apt packages",
-                "RUN apt-get update",
-                "RUN apt-get install -y \\",
-                apt_install_str,
-                "RUN apt-get clean",
-                "RUN rm -rf /var/lib/apt/lists/*"
-            ])
-        else:
-            apt_block = ""
+        base_image = self.get_base_image(task)
+        if base_image == self.MEDIA_BASE_IMAGE:
+            apt_packages = [pkg for pkg in apt_packages if pkg not in self.MEDIA_APT_PACKAGES]
+        apt_block = self._get_apt_block(apt_packages, "task-specific")
+        pip_block = self._get_pip_block(pip_packages, task_output_dir, "task-specific")
         env_block = "# Set environment variables" \
             if len(env_vars) > 0 \
             else ""
@@ -42,28 +67,217 @@ class Builder:
             env_block = env_block + f"\nENV {env}"
         replacements = {
             "task.apt_packages": apt_block,
+            "task.pip_packages": pip_block,
             "task.env_vars": env_block,
             'task.name': task.name(),
+            'task.base_image': base_image,
         }
+        self._write_dockerfile(template_content, replacements, task_output_dir)
+
+    def create_media_base_dockerfile(self, base_output_dir: str, dockerfile_template_path: str) -> None:
+        if not os.path.exists(dockerfile_template_path):
+            raise FileNotFoundError(f"Media base Dockerfile template not found at {dockerfile_template_path}")
+        with open(dockerfile_template_path, 'r') as f:
+            template_content = f.read()
+        replacements = {
+            "base.python_image": self.PYTHON_IMAGE,
+            "base.apt_packages": self._get_apt_block(self.MEDIA_APT_PACKAGES, "shared media"),
+            "base.pip_packages": self._get_pip_block(self.MEDIA_PIP_PACKAGES, base_output_dir, "shared media"),
+        }
+        self._write_dockerfile(template_content, replacements, base_output_dir)
+
+    def get_base_image(self, task: TaskInterface) -> str:
+        """
+        Image the task image is built FROM. Tasks that declare any of the shared media
+        dependencies get the media base, so those layers are built and stored only once.
+        """
+        apt_packages = task.dependencies().get('other', [])
+        pip_names = {self._get_pip_name(pkg) for pkg in task.dependencies().get('pip', [])}
+        media_pip_names = {self._get_pip_name(pkg) for pkg in self.MEDIA_PIP_PACKAGES}
+        uses_media = any(pkg in self.MEDIA_APT_PACKAGES for pkg in apt_packages) \
+            or len(pip_names & media_pip_names) > 0
+        return self.MEDIA_BASE_IMAGE if uses_media else self.PYTHON_IMAGE
+
+    def build_media_base_image(self, client: DockerClient, commander_dir: str, log: Callable[[str], None]) -> str:
+        """Build the shared media base image once, even when several task builds need it concurrently."""
+        with self._base_lock:
+            base_dir = f"{commander_dir}/tmp/base/media"
+            os.makedirs(base_dir, exist_ok=True)
+            self.create_media_base_dockerfile(base_dir, f"{commander_dir}/container/Dockerfile.media")
+            build_hash = self.get_build_hash(base_dir, self.MEDIA_PIP_PACKAGES + self.MEDIA_APT_PACKAGES)
+            if not self.is_image_cached(client, self.MEDIA_BASE_IMAGE, build_hash):
+                self._build(client, base_dir, self.MEDIA_BASE_IMAGE, build_hash, log)
+            return build_hash
+
+    def build_image(self, client: DockerClient, task: TaskInterface, commander_dir: str, log: Callable[[str], None]) -> str:
+        """
+        Render the task Dockerfile and build its image unless one with the same build hash exists.
+        Build output is passed to log line by line as the daemon streams it.
+        """
+        image_tag = self.get_image_tag(task)
+        dockerfile_template_path = f"{commander_dir}/container/Dockerfile"
+        path_task_dir = f"{commander_dir}/tmp/tasks/{task.name()}"
+        os.makedirs(path_task_dir, exist_ok=True)
+        os.makedirs(f"{path_task_dir}/container", exist_ok=True)
+        self.create_task_dockerfile(task, path_task_dir, dockerfile_template_path)
+        spec = [task.dependencies()]
+        if self.get_base_image(task) == self.MEDIA_BASE_IMAGE:
+            spec.append(self.build_media_base_image(client, commander_dir, log))
+        build_hash = self.get_build_hash(path_task_dir, spec)
+        if not self.is_image_cached(client, image_tag, build_hash):
+            self._build(client, path_task_dir, image_tag, build_hash, log)
+        return image_tag
+
+    def _build(self, client: DockerClient, path: str, image_tag: str, build_hash: str, log: Callable[[str], None]) -> None:
+        """
+        Build the image. With pip packages the Dockerfile is built under a stage tag first,
+        and only the image committed after pip install gets the final tag and build hash,
+        so an interrupted install is never mistaken for a cached image.
+        """
+        has_pip_packages = os.path.exists(f"{path}/requirements.txt")
+        build_tag = f"{image_tag}-stage" if has_pip_packages else image_tag
+        build_labels = {} if has_pip_packages else {self.BUILD_HASH_LABEL: build_hash}
+        log(f"Building Docker image '{build_tag}' from {path}")
+        build_stream = client.api.build(
+            path = path,
+            tag = build_tag,
+            labels = build_labels,
+            rm = True,  # Remove intermediate containers
+            forcerm = True,  # Always remove intermediate containers
+            decode = True
+        )
+        build_logs = []
+        for chunk in build_stream:
+            build_logs.append(chunk)
+            if 'error' in chunk:
+                raise docker.errors.BuildError(chunk['error'].strip(), build_logs)
+            line = chunk.get('stream', '').strip()
+            if line:
+                log(f"[{image_tag}] {line}")
+        if has_pip_packages:
+            self._install_pip_packages(client, build_tag, image_tag, build_hash, log)
+        image = client.images.get(image_tag)
+        self.mark_built(image_tag)
+        log(f"Successfully built image {image.short_id}")
+
+    def _install_pip_packages(self, client: DockerClient, stage_tag: str, image_tag: str, build_hash: str, log: Callable[[str], None]) -> None:
+        """
+        Install the stage image's requirements in a container with the shared pip cache mounted
+        and commit the result as the final image. The classic builder used by docker-py cannot
+        mount volumes during a build, so this step runs outside of the Dockerfile.
+        """
+        log(f"[{image_tag}] Installing pip packages with the shared cache at {self._pip_cache.path}")
+        container = client.containers.run(
+            image = stage_tag,
+            command = self._pip_cache.get_install_cmd("/tmp/requirements.txt"),
+            detach = True,
+            volumes = self._pip_cache.get_volumes(),
+            labels = {self.CONTAINER_LABEL: image_tag, self.ROLE_LABEL: self._role}
+        )
+        try:
+            exit_code = container.wait()['StatusCode']
+            for line in container.logs().decode('utf-8', errors='replace').splitlines():
+                if line.strip():
+                    log(f"[{image_tag}] {line.strip()}")
+            if exit_code != 0:
+                raise docker.errors.BuildError(f"pip install failed with exit code {exit_code}", [])
+            repository, tag = image_tag.split(':', 1)
+            container.commit(repository=repository, tag=tag, changes=[
+                f"CMD {json.dumps(self.IMAGE_CMD)}",
+                f"LABEL {self.BUILD_HASH_LABEL}={build_hash}"
+            ])
+        finally:
+            container.remove(force=True)
+            try:
+                client.images.remove(stage_tag)
+            except docker.errors.DockerException:
+                pass
+        with self._pip_cache_lock:
+            freed_bytes = self._pip_cache.prune()
+        if freed_bytes > 0:
+            log(f"Pruned {freed_bytes / 1024**2:.1f} MB from the pip cache")
+
+    def is_image_cached(self, client: DockerClient, image_tag: str, build_hash: str) -> bool:
+        """
+        True if an image with the given tag was built from the same build hash.
+        With force_rebuild, every tag is rebuilt once per commander run.
+        """
+        if self._force_rebuild and image_tag not in self._built_tags:
+            return False
+        try:
+            image = client.images.get(image_tag)
+        except docker.errors.ImageNotFound:
+            return False
+        return image.labels.get(self.BUILD_HASH_LABEL) == build_hash
+
+    def mark_built(self, image_tag: str) -> None:
+        self._built_tags.add(image_tag)
+
+    def get_image_tag(self, task: TaskInterface) -> str:
+        return f"task-commander:{task.name()}"
+
+    def get_build_hash(self, output_dir: str, spec: Any) -> str:
+        """
+        Hash of the rendered Dockerfile plus the spec it was rendered from. The spec of a
+        task on the media base includes the base build hash, so it is rebuilt with its base.
+        """
+        with open(f"{output_dir}/Dockerfile", 'rb') as f:
+            dockerfile_content = f.read()
+        digest = hashlib.sha256(dockerfile_content)
+        digest.update(json.dumps(spec, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _get_apt_block(self, apt_packages: List[str], scope: str) -> str:
+        if not apt_packages:
+            return ""
+        apt_install_lines = []
+        for pkg in apt_packages:
+            apt_install_lines.append(f"    {pkg}")
+        apt_install_str = " \\\n".join(apt_install_lines)
+        return "\n".join([
+            f"# Install {scope} apt packages",
+            "RUN apt-get update",
+            "RUN apt-get install -y \\",
+            apt_install_str,
+            "RUN apt-get clean",
+            "RUN rm -rf /var/lib/apt/lists/*"
+        ])
+
+    def _get_pip_block(self, pip_packages: List[str], output_dir: str, scope: str) -> str:
+        """The requirements are installed after the build, through the shared pip cache."""
+        requirements_path = f"{output_dir}/requirements.txt"
+        if not pip_packages:
+            if os.path.exists(requirements_path):
+                os.remove(requirements_path)
+            return ""
+        with open(requirements_path, 'w') as f:
+            f.write('\n'.join(pip_packages) + '\n')
+        return "\n".join([
+            f"# {scope.capitalize()} pip packages, installed with the commander's pip cache",
+            "COPY requirements.txt /tmp/requirements.txt"
+        ])
+
+    def _get_pip_name(self, requirement: str) -> str:
+        return re.split(r"[<>=!~\[; ]", requirement.strip(), maxsplit=1)[0].lower()
+
+    def _write_dockerfile(self, template_content: str, replacements: Dict[str, str], output_dir: str) -> None:
         docker_content = template_content
         for key, value in replacements.items():
             docker_content = docker_content.replace("{{" + key + "}}", value)
-        dockerfile_path = f"{task_output_dir}/Dockerfile"
-        with open(dockerfile_path, 'w') as f:
+        with open(f"{output_dir}/Dockerfile", 'w') as f:
             f.write(docker_content)
 
-    def does_task_dockerfile_exist(self, client: DockerClient, dir: str, task_name: str, image_tag: str) -> bool:
-        image_exists = False
-        has_dockerfile = os.path.exists(f"{dir}/tmp/tasks/{task_name}/Dockerfile")
-        if not self.FORCE_REBUILD and not has_dockerfile:
-            try:
-                client.images.get(image_tag)
-                image_exists = True
-                if self.print_docker_container_lifecycle:
-                    self._print(f"Using cached Docker image '{image_tag}'")
-            except docker.errors.ImageNotFound:
-                image_exists = False
-        return image_exists
+    def get_labels(self, task: TaskInterface) -> Dict[str, str]:
+        """
+        Labels of every task container, used to find them with server-side filters. The role
+        tells commander containers apart from those of agents sharing the same Docker daemon.
+        """
+        return {self.CONTAINER_LABEL: task.name(), self.ROLE_LABEL: self._role}
+
+    @staticmethod
+    def get_commander_label_filter() -> List[str]:
+        """Label filter matching the containers started by commanders, and not by agents."""
+        return [Builder.CONTAINER_LABEL, f"{Builder.ROLE_LABEL}={Builder.COMMANDER_ROLE}"]
 
     def get_memory(self, GBs: int) -> str:
         return f"{GBs}g"
@@ -82,29 +296,51 @@ class Builder:
             if in_container else \
             full_path
 
+    def write_params_file(self, task_name: str, params: Dict[str, Any], in_container: bool = True) -> str:
+        """
+        Write the run params to a file in the task's container dir, which TaskLauncher reads
+        with --params-file. Shards get their own file. Returns the path as seen by the launcher.
+        """
+        run_name = params.get('shard', {}).get('output_name', task_name)
+        if not self.is_safe_name(task_name) or not self.is_safe_name(run_name):
+            raise ValueError(f"invalid run name '{run_name}' for task '{task_name}'")
+        relative_path = f"tasks/{task_name}/container/{run_name}.params.json"
+        host_path = os.path.join(self.get_out_dir(False), relative_path)
+        os.makedirs(os.path.dirname(host_path), exist_ok=True)
+        with open(f"{host_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(params, f, ensure_ascii=False)
+        os.replace(f"{host_path}.tmp", host_path)
+        return os.path.join(self.get_out_dir(in_container), relative_path)
+
     def get_container_cmd(self, task: TaskInterface, params: Dict[str, Any]) -> List[str]:
         output_dir = self.get_out_dir()
-        dependencies = task.dependencies()
-        pip_requirements = '\n'.join(dependencies.get('pip', []))
-        cmd_pip_requirements = f"""cat > /tmp/requirements.txt << "EOF"
-{pip_requirements}
-EOF
-python -m venv /tmp/venv
-. /tmp/venv/bin/activate
-pip install --no-cache-dir --root-user-action=ignore -r /tmp/requirements.txt"""
-        cmd_run_python = f"""python /app/TaskLauncher.py \
+        params_path = self.write_params_file(task.name(), params)
+        cmd_body = f"""python /app/TaskLauncher.py \
             --outdir {output_dir} \
             --task {task.__module__} \
-            --data '{json.dumps(params)}'"""
-        cmd_body = f"{cmd_pip_requirements} && {cmd_run_python}"
+            --params-file {params_path}"""
         if task.interval() is None:
-            cmd_body = f"{cmd_body} && tail -f /dev/null"
+            # keep-alive containers idle even when the run fails, instead of exiting and being restarted
+            cmd_body = f"{cmd_body}; tail -f /dev/null"
         cmd = [
             "sh", "-c",
             cmd_body
         ]
         return cmd
 
+    def get_resident_cmd(self, task: TaskInterface) -> List[str]:
+        """Command for a warm worker container that executes runs received on its unix socket."""
+        task_dir = f"{self.get_out_dir()}/tasks/{task.name()}"
+        cmd = [
+            "python", "/app/TaskLauncher.py",
+            "--outdir", self.get_out_dir(),
+            "--task", task.__module__,
+            "--serve", ResidentWorker.get_socket_path(task_dir)
+        ]
+        if hasattr(os, 'getuid'):
+            cmd += ["--serve-owner", f"{os.getuid()}:{os.getgid()}"]
+        return cmd
+
     def get_volumes(self, commander_dir: str, task: TaskInterface, params: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
         default_volumes = {
             commander_dir: {
@@ -1,55 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+from container.Builder import Builder
+from container.SharedClient import SharedClient
 from docker.models.containers import Container
-from typing import Dict, List
-import docker
+from typing import Dict, List, Set
 
 
 class Cleaner:
-    def cleanup_orphaned_containers(self) -> List[str]:
+    MAX_PARALLEL = 16
+    STOP_TIMEOUT = 5
+
+    def __init__(self, docker_client: SharedClient) -> None:
+        self._docker_client = docker_client
+
+    def cleanup_orphaned_containers(self, keep_ids: List[str] | Set[str] = ()) -> List[str]:
         """Cleanup any orphaned task-commander containers from previous runs.
-        
+
+        Containers are found by their task-commander and commander role labels with a
+        server-side filter, so agent containers on the same daemon are left alone, then
+        stopped and removed in parallel.
+
+        Args:
+            keep_ids: IDs of containers re-adopted by the commander, which are left running.
+
         Returns:
             List of container IDs that were successfully cleaned up.
-            
+
         Raises:
             Exception: If Docker operations fail.
         """
-        client = docker.from_env()
-        all_containers = client.containers.list(all=True)
-        orphaned = []
-        for c in all_containers:
-            try:
-                if c.image.tags and any(tag.startswith('task-commander:') for tag in c.image.tags):
-                    orphaned.append(c)
-            except Exception:
-                pass
-        cleaned_ids = []
-        for container in orphaned:
-            try:
-                container.stop(timeout=5)
-                container.remove()
-                cleaned_ids.append(container.short_id)
-            except Exception:
-                pass
-        return cleaned_ids
+        client = self._docker_client.get()
+        labeled_containers = client.containers.list(all=True, filters={"label": Builder.get_commander_label_filter()})
+        orphaned = [c for c in labeled_containers if c.id not in keep_ids]
+        return self._stop_and_remove_all(orphaned)
 
     def cleanup_containers(self, running_containers: Dict[str, Container]) -> List[str]:
-        """Stop and remove all running containers.
-        
+        """Stop and remove all running containers in parallel.
+
         Returns:
             List of container IDs that were successfully cleaned up.
-            
+
         Raises:
             Exception: If Docker operations fail.
         """
         if not running_containers:
             return []
-        cleaned_ids = []
-        for task_name, container in list(running_containers.items()):
-            try:
-                container.stop(timeout=5)
-                container.remove()
-                cleaned_ids.append(container.short_id)
-            except Exception:
-                pass
+        cleaned_ids = self._stop_and_remove_all(list(running_containers.values()))
         running_containers.clear()
         return cleaned_ids
+
+    def _stop_and_remove_all(self, containers: List[Container]) -> List[str]:
+        if not containers:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.MAX_PARALLEL, len(containers))) as executor:
+            results = list(executor.map(self._stop_and_remove, containers))
+        return [short_id for short_id in results if short_id is not None]
+
+    def _stop_and_remove(self, container: Container) -> str | None:
+        try:
+            container.stop(timeout=self.STOP_TIMEOUT)
+            container.remove()
+            return container.short_id
+        except Exception:
+            return None
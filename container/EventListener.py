@@ -0,0 +1,53 @@
+from container.Builder import Builder
+from docker.client import DockerClient
+from typing import Callable
+import threading
+
+
+class EventListener:
+    """Background subscriber to Docker container events of the containers started by commanders."""
+    EVENTS = ["die", "oom"]
+
+    def __init__(self, client: DockerClient, on_event: Callable[[str, str, int | None], None]) -> None:
+        """
+        Args:
+            client: Docker client used to open the events stream.
+            on_event: Called from the listener thread as on_event(container_id, action, exit_code).
+        """
+        self._client = client
+        self._on_event = on_event
+        self._stream = None
+        self._thread = None
+        self.error = None
+
+    def start(self) -> None:
+        self._stream = self._client.events(
+            decode = True,
+            filters = {"type": "container", "event": self.EVENTS, "label": Builder.get_commander_label_filter()}
+        )
+        self._thread = threading.Thread(target=self._listen, name="docker-events", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception:
+                pass
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _listen(self) -> None:
+        try:
+            for event in self._stream:
+                actor = event.get("Actor", {})
+                attributes = actor.get("Attributes", {})
+                exit_code = attributes.get("exitCode")
+                self._on_event(
+                    actor.get("ID", event.get("id")),
+                    event.get("Action", event.get("status")),
+                    int(exit_code) if exit_code is not None else None
+                )
+        except Exception as e:
+            self.error = e
@@ -0,0 +1,66 @@
+from typing import Dict, List
+import os
+
+
+class PipCache:
+    """
+    Host directory mounted as pip's cache while task images install their pip packages,
+    so downloaded and locally built wheels are reused by every later build and by every
+    task that shares a dependency. The directory is pruned to a size budget, least
+    recently used files first.
+    """
+    CONTAINER_PATH = "/pip-cache"
+    DEFAULT_MAX_GB = 10.0
+
+    def __init__(self, path: str, max_gb: float = DEFAULT_MAX_GB) -> None:
+        self.path = path
+        self._max_bytes = int(max_gb * 1024**3)
+
+    def get_volumes(self) -> Dict[str, Dict[str, str]]:
+        os.makedirs(self.path, exist_ok=True)
+        return {
+            self.path: {
+                "bind": self.CONTAINER_PATH,
+                "mode": "rw"
+            }
+        }
+
+    def get_install_cmd(self, requirements_path: str) -> List[str]:
+        """pip install through the mounted cache; the cache is handed back to the host user so it can be pruned."""
+        cmd_body = f"pip install --root-user-action=ignore --cache-dir {self.CONTAINER_PATH} -r {requirements_path}"
+        if hasattr(os, 'getuid'):
+            cmd_body = f"{cmd_body} && chown -R {os.getuid()}:{os.getgid()} {self.CONTAINER_PATH}"
+        return ["sh", "-c", cmd_body]
+
+    def prune(self) -> int:
+        """Delete the least recently used files until the cache fits its budget. Return the bytes freed."""
+        entries = []
+        total_bytes = 0
+        for dir_path, _, file_names in os.walk(self.path):
+            for file_name in file_names:
+                file_path = os.path.join(dir_path, file_name)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                entries.append((max(stat.st_atime, stat.st_mtime), stat.st_size, file_path))
+                total_bytes += stat.st_size
+        freed_bytes = 0
+        for _, size, file_path in sorted(entries):
+            if total_bytes - freed_bytes <= self._max_bytes:
+                break
+            try:
+                os.remove(file_path)
+                freed_bytes += size
+            except OSError:
+                continue
+        self._remove_empty_dirs()
+        return freed_bytes
+
+    def _remove_empty_dirs(self) -> None:
+        for dir_path, _, _ in os.walk(self.path, topdown=False):
+            if dir_path != self.path and not os.listdir(dir_path):
+                try:
+                    os.rmdir(dir_path)
+                except OSError:
+                    continue
@@ -0,0 +1,72 @@
+from typing import Any, Callable, Dict, Tuple
+import json
+import os
+import socket
+import time
+
+
+class ResidentWorker:
+    """
+    Command loop for warm task containers. The worker listens on a unix socket in the
+    task's mounted container dir and runs one task execution per connection, so the
+    container, its imports and anything the task caches survive between runs.
+    Protocol: the client sends the run params as one JSON line, the worker answers
+    with one JSON line once the run has finished.
+    """
+    SOCKET_NAME = "worker.sock"
+    CONNECT_RETRY_DELAY = 0.5
+
+    @staticmethod
+    def get_socket_path(task_dir: str) -> str:
+        return os.path.join(task_dir, "container", ResidentWorker.SOCKET_NAME)
+
+    @staticmethod
+    def serve(socket_path: str, run: Callable[[Dict[str, Any]], Dict[str, Any]], owner: Tuple[int, int] | None = None) -> None:
+        """
+        Accept run requests forever, calling run(params) for each one. The socket is created
+        by root in the container, so it is handed to owner (the commander's uid and gid) and
+        nobody else on the host can connect to it.
+        """
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(socket_path)
+        if owner is not None:
+            os.chown(socket_path, *owner)
+        os.chmod(socket_path, 0o660)
+        server.listen(1)
+        while True:
+            conn, _ = server.accept()
+            with conn, conn.makefile('rw', encoding='utf-8') as stream:
+                try:
+                    params = json.loads(stream.readline())
+                    reply = {'status': 'done', **run(params)}
+                except Exception as e:
+                    reply = {'status': 'error', 'error': str(e)}
+                stream.write(json.dumps(reply) + "\n")
+                stream.flush()
+
+    @staticmethod
+    def request(socket_path: str, params: Dict[str, Any], connect_timeout: float) -> Dict[str, Any]:
+        """
+        Send one run request and block until the worker replies. Connection attempts are
+        retried for connect_timeout seconds while the container is still starting up.
+        """
+        deadline = time.time() + connect_timeout
+        while True:
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                client.connect(socket_path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                client.close()
+                if time.time() >= deadline:
+                    raise TimeoutError(f"resident worker not reachable at {socket_path}")
+                time.sleep(ResidentWorker.CONNECT_RETRY_DELAY)
+        with client, client.makefile('rw', encoding='utf-8') as stream:
+            stream.write(json.dumps(params) + "\n")
+            stream.flush()
+            reply_line = stream.readline()
+        if not reply_line:
+            raise ConnectionError("resident worker closed the connection before replying")
+        return json.loads(reply_line)
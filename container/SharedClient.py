@@ -0,0 +1,53 @@
+from docker.client import DockerClient
+import docker
+import threading
+import time
+
+
+class SharedClient:
+    """
+    One long-lived Docker client, and so one HTTP connection pool to the daemon, shared by
+    the commander, the image builder, the cleaner and the events listener. The daemon is
+    pinged at most once per HEALTH_CHECK_INTERVAL; an unhealthy client is replaced.
+    """
+    MAX_POOL_SIZE = 32
+    TIMEOUT = 120
+    HEALTH_CHECK_INTERVAL = 30.0
+
+    def __init__(self, max_pool_size: int = MAX_POOL_SIZE, timeout: int = TIMEOUT) -> None:
+        self._max_pool_size = max_pool_size
+        self._timeout = timeout
+        self._client = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> DockerClient:
+        """Return the shared client, creating or replacing it if needed. Raises DockerException if the daemon is down."""
+        with self._lock:
+            if self._client is not None and time.time() - self._last_check > self.HEALTH_CHECK_INTERVAL:
+                if not self._ping():
+                    self._close()
+            if self._client is None:
+                self._client = docker.from_env(max_pool_size=self._max_pool_size, timeout=self._timeout)
+                self._last_check = time.time()
+            return self._client
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def _ping(self) -> bool:
+        try:
+            self._client.ping()
+            self._last_check = time.time()
+            return True
+        except Exception:
+            return False
+
+    def _close(self) -> None:
+        if self._client is not None:
+            try:
+                self._client.close()
+            except Exception:
+                pass
+        self._client = None
@@ -1,20 +1,6 @@
 from dotenv import load_dotenv
 from TaskCommander import TaskCommander
-from task.DirManager import DirManager
-from task.DirObserver import DirObserver
-from task.FlaskTask import FlaskTask
-from task.LlamaLLM import LlamaLLM
-from task.LlamaVideoSummary import LlamaVideoSummary
-from task.Message import Message
-from task.SceneChangeDetectorTask import SceneChangeDetectorTask
-from task.SceneFrameExtractorTask import SceneFrameExtractorTask
-from task.SystemMonitor import SystemMonitor
-from task.TaskData import TaskData
-from task.ThumbnailCreatorTask import ThumbnailCreatorTask
-from task.UiFlask import UiFlask
-from task.WhisperSubtitleTask import WhisperSubtitleTask
-from task.YouTubeDownloader import YouTubeDownloader
-from task.YouTubeScannerTask import YouTubeScannerTask
+from task.TaskRegistry import TaskRegistry
 import json
 import os
 
@@ -33,7 +19,7 @@ DEBUG = True
 def main() -> None:
     tasks = [
         #{
-        #    'task': SceneChangeDetectorTask(),
+        #    'task': TaskRegistry.get('scene_change_detector'),
         #    'parameters': {
         #        'video_paths': [
         #            PATH_DIR_SCENES
@@ -43,7 +29,7 @@ def main() -> None:
         #    'order': 0
         #},
         #{
-        #    'task': SceneFrameExtractorTask(),
+        #    'task': TaskRegistry.get('scene_frame_extractor'),
         #    'parameters': {
         #        'video_paths': [
         #            PATH_DIR_SCENES
@@ -53,7 +39,7 @@ def main() -> None:
         #    'order': 1
         #},
         {
-            'task': ThumbnailCreatorTask(),
+            'task': TaskRegistry.get('thumbnail_creator'),
             'parameters': {
                 'video_paths': [
                     PATH_DIR_SCENES
@@ -64,12 +50,12 @@ def main() -> None:
             'order': 2
         },
         {
-            'task': UiFlask(),
+            'task': TaskRegistry.get('ncommander_ui'),
             'parameters': {'port': 7000},
             'order': 101
         },
         # {
-        #     'task': LlamaLLM(),
+        #     'task': TaskRegistry.get('llama_llm'),
         #     'parameters': {
         #         'prompts': [
         #             "What is a black hole?",
@@ -81,12 +67,12 @@ def main() -> None:
         #     'order': 1
         # },
         # {
-        #     'task': YouTubeScannerTask(),
+        #     'task': TaskRegistry.get('youtube_scanner'),
         #     'parameters': {'channels': YOUTUBE_CHANNELS_JSON},
         #     'order': 0
         # },
         # {
-        #     'task': YouTubeDownloader(),
+        #     'task': TaskRegistry.get('youtube_downloader'),
         #     'parameters': {
         #         'video_urls': [
         #             'https://www.youtube.com/watch?v=3QlHvz_N8m8',
@@ -96,14 +82,14 @@ def main() -> None:
         #     'order': 2
         # },
         # {
-        #     'task': WhisperSubtitleTask(),
+        #     'task': TaskRegistry.get('whisper_subtitles'),
         #     'parameters': {
         #         'dir_path': '/app/var/youtube_downloader',
         #     },
         #     'order': 1
         # },
         # {
-        #     'task': LlamaVideoSummary(),
+        #     'task': TaskRegistry.get('llama_video_summary'),
         #     'parameters': {
         #         'dir_path': '/app/var/youtube_downloader',
         #         'model_name': LLM_MODEL_NAME,
@@ -114,12 +100,12 @@ def main() -> None:
         #     'order': 0
         # },
         # {
-        #     'task': Message(),
+        #     'task': TaskRegistry.get('random_messager'),
         #     'parameters': {},
         #     'order': 99
         # },
         # {
-        #     'task': DirObserver(),
+        #     'task': TaskRegistry.get('dir_observer'),
         #     'parameters': {
         #         'paths': [
         #             f"{ROOT}/output",
@@ -129,17 +115,17 @@ def main() -> None:
         #     'order': 3
         # },
         {
-            'task': SystemMonitor(),
+            'task': TaskRegistry.get('system_monitor'),
             'parameters': {},
             'order': 100
         },
         # {
-        #     'task': TaskData(),
+        #     'task': TaskRegistry.get('task_data'),
         #     'parameters': {},
         #     'order': 1
         # },
         # {
-        #     'task': DirManager(),
+        #     'task': TaskRegistry.get('dir_manager'),
         #     'parameters': {},
         #     'order': 5
         # },
@@ -0,0 +1,93 @@
+from typing import Any, Dict, List
+import psutil
+import time
+
+
+class AdmissionController:
+    """
+    Tracks CPU and memory reserved by running tasks against host capacity and
+    holds due tasks in a FIFO ready queue until their reservation fits.
+    """
+    STARVATION_TIMEOUT = 60.0
+
+    def __init__(self, capacity_cpus: float | None = None, capacity_memory_gb: float | None = None) -> None:
+        self.capacity_cpus = float(capacity_cpus or psutil.cpu_count() or 1)
+        self.capacity_memory_gb = float(capacity_memory_gb or psutil.virtual_memory().total / (1024**3))
+        self._reservations: Dict[str, Dict[str, Any]] = {}
+        self._ready: Dict[str, Dict[str, Any]] = {}
+
+    def submit(self, task_name: str, cpus: float, memory_gb: float, releasable: bool = True) -> None:
+        """
+        Add a due task to the ready queue. Requests are clamped to host capacity so
+        oversized tasks can still run alone. Non-releasable reservations (keep-alive
+        tasks) never block admission of other tasks when they are all that is left.
+        """
+        if task_name in self._ready or task_name in self._reservations:
+            return
+        self._ready[task_name] = {
+            'cpus': min(float(cpus), self.capacity_cpus),
+            'memory_gb': min(float(memory_gb), self.capacity_memory_gb),
+            'releasable': releasable,
+            'submitted': time.time(),
+        }
+
+    def admit(self) -> List[str]:
+        """
+        Reserve resources for every ready task that fits, in FIFO order. Smaller tasks
+        may be admitted ahead of a blocked one, unless the blocked head has waited for
+        longer than STARVATION_TIMEOUT, in which case the queue drains for it.
+        """
+        admitted = []
+        for task_name, request in list(self._ready.items()):
+            if self._fits(request):
+                del self._ready[task_name]
+                self._reservations[task_name] = {**request, 'admitted': time.time()}
+                admitted.append(task_name)
+            elif time.time() - request['submitted'] > self.STARVATION_TIMEOUT:
+                break
+        return admitted
+
+    def reserve(self, task_name: str, cpus: float, memory_gb: float, releasable: bool = True) -> None:
+        """Reserve resources immediately, bypassing the ready queue (e.g. for re-adopted containers)."""
+        self.submit(task_name, cpus, memory_gb, releasable)
+        request = self._ready.pop(task_name, None)
+        if request is not None:
+            self._reservations[task_name] = {**request, 'admitted': time.time()}
+
+    def release(self, task_name: str) -> None:
+        self._reservations.pop(task_name, None)
+
+    def is_waiting(self, task_name: str) -> bool:
+        return task_name in self._ready
+
+    def waiting(self) -> List[str]:
+        """Names of the tasks in the ready queue, in FIFO order."""
+        return list(self._ready)
+
+    def withdraw(self, task_name: str) -> None:
+        """Remove a task from the ready queue, e.g. because it was placed on a worker agent."""
+        self._ready.pop(task_name, None)
+
+    def reserved_cpus(self) -> float:
+        return sum(r['cpus'] for r in self._reservations.values())
+
+    def reserved_memory_gb(self) -> float:
+        return sum(r['memory_gb'] for r in self._reservations.values())
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            'capacity_cpus': self.capacity_cpus,
+            'capacity_memory_gb': round(self.capacity_memory_gb, 2),
+            'reserved_cpus': self.reserved_cpus(),
+            'reserved_memory_gb': round(self.reserved_memory_gb(), 2),
+            'reservations': {name: dict(r) for name, r in self._reservations.items()},
+            'ready': {name: dict(r) for name, r in self._ready.items()},
+        }
+
+    def _fits(self, request: Dict[str, Any]) -> bool:
+        releasable_reserved = any(r['releasable'] for r in self._reservations.values())
+        if not releasable_reserved:
+            return True
+        fits_cpus = self.reserved_cpus() + request['cpus'] <= self.capacity_cpus
+        fits_memory = self.reserved_memory_gb() + request['memory_gb'] <= self.capacity_memory_gb
+        return fits_cpus and fits_memory
@@ -0,0 +1,146 @@
+from typing import Any, Callable, Dict, List, Tuple
+from xmlrpc.server import SimpleXMLRPCServer
+import hmac
+import json
+import threading
+import time
+import xmlrpc.client
+
+
+class AgentRegistry:
+    """
+    Commander side of multi-node execution. Worker agents (TaskAgent.py) register their
+    CPU and memory capacity over XML-RPC and report finished runs back, and the commander
+    places runs on the agent with the most free capacity that fits them. Every call in
+    either direction carries a token shared by the commander and its agents.
+    """
+    HEARTBEAT_TIMEOUT = 30.0
+
+    def __init__(self, host: str, port: int, token: str, on_change: Callable[[], None]) -> None:
+        self._host = host
+        self._port = port
+        self._token = token
+        self._on_change = on_change
+        self._agents: Dict[str, Dict[str, Any]] = {}
+        self._finished: List[Tuple[str, int | None, Dict[str, Any] | None]] = []
+        self._lock = threading.Lock()
+        self._server = None
+
+    def start(self) -> None:
+        self._server = SimpleXMLRPCServer((self._host, self._port), allow_none=True, logRequests=False)
+        self._server.register_function(self._register, 'register')
+        self._server.register_function(self._heartbeat, 'heartbeat')
+        self._server.register_function(self._finished_run, 'finished')
+        thread = threading.Thread(target=self._server.serve_forever, name="agent-registry", daemon=True)
+        thread.start()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def has_agents(self) -> bool:
+        with self._lock:
+            return len(self._agents) > 0
+
+    def place(self, run_key: str, cpus: float, memory_gb: float) -> str | None:
+        """Reserve capacity for a run on the agent with the most free CPUs that fits it."""
+        with self._lock:
+            candidates = [
+                (agent['cpus'] - agent['reserved_cpus'], agent_id)
+                for agent_id, agent in self._agents.items()
+                if agent['reserved_cpus'] + cpus <= agent['cpus']
+                and agent['reserved_memory_gb'] + memory_gb <= agent['memory_gb']
+            ]
+            if not candidates:
+                return None
+            _, agent_id = max(candidates)
+            agent = self._agents[agent_id]
+            agent['reserved_cpus'] += cpus
+            agent['reserved_memory_gb'] += memory_gb
+            agent['runs'][run_key] = (cpus, memory_gb)
+            return agent_id
+
+    def launch(self, agent_id: str, run_key: str, task_module: str, params: Dict[str, Any]) -> None:
+        """Start a placed run on its agent; the reservation is dropped if the agent refuses it."""
+        try:
+            self._get_proxy(agent_id).launch(self._token, run_key, task_module, json.dumps(params))
+        except Exception:
+            self.release(run_key)
+            raise
+
+    def stop_run(self, agent_id: str, run_key: str) -> None:
+        self._get_proxy(agent_id).stop(self._token, run_key)
+
+    def release(self, run_key: str) -> None:
+        with self._lock:
+            for agent in self._agents.values():
+                cpus, memory_gb = agent['runs'].pop(run_key, (0.0, 0.0))
+                agent['reserved_cpus'] -= cpus
+                agent['reserved_memory_gb'] -= memory_gb
+
+    def pop_finished(self) -> List[Tuple[str, int | None, Dict[str, Any] | None]]:
+        """
+        Return (run_key, exit_code, output) of every run reported since the last call. Runs
+        on agents that stopped sending heartbeats are reported as failed, without output.
+        """
+        with self._lock:
+            now = time.time()
+            lost_ids = [
+                agent_id for agent_id, agent in self._agents.items()
+                if now - agent['last_seen'] > self.HEARTBEAT_TIMEOUT
+            ]
+            for agent_id in lost_ids:
+                agent = self._agents.pop(agent_id)
+                self._finished.extend((run_key, None, None) for run_key in agent['runs'])
+            finished, self._finished = self._finished, []
+        return finished
+
+    def _register(self, token: str, agent_id: str, url: str, cpus: float, memory_gb: float) -> bool:
+        if not self._is_authorized(token):
+            return False
+        with self._lock:
+            previous = self._agents.get(agent_id)
+            self._agents[agent_id] = {
+                'url': url,
+                'cpus': float(cpus),
+                'memory_gb': float(memory_gb),
+                'reserved_cpus': previous['reserved_cpus'] if previous else 0.0,
+                'reserved_memory_gb': previous['reserved_memory_gb'] if previous else 0.0,
+                'runs': previous['runs'] if previous else {},
+                'last_seen': time.time(),
+            }
+        self._on_change()
+        return True
+
+    def _heartbeat(self, token: str, agent_id: str) -> bool:
+        """Return False for unknown agents, which makes them register again."""
+        if not self._is_authorized(token):
+            return False
+        with self._lock:
+            if agent_id not in self._agents:
+                return False
+            self._agents[agent_id]['last_seen'] = time.time()
+            return True
+
+    def _finished_run(self, token: str, agent_id: str, run_key: str, exit_code: int | None, output_json: str) -> bool:
+        """Return False for runs the commander did not place on this agent."""
+        if not self._is_authorized(token):
+            return False
+        output = json.loads(output_json) if output_json else None
+        with self._lock:
+            agent = self._agents.get(agent_id)
+            if agent is None or run_key not in agent['runs']:
+                return False
+            agent['last_seen'] = time.time()
+            self._finished.append((run_key, exit_code, output))
+        self._on_change()
+        return True
+
+    def _is_authorized(self, token: str) -> bool:
+        return isinstance(token, str) and hmac.compare_digest(token.encode(), self._token.encode())
+
+    def _get_proxy(self, agent_id: str) -> xmlrpc.client.ServerProxy:
+        with self._lock:
+            url = self._agents[agent_id]['url']
+        return xmlrpc.client.ServerProxy(url, allow_none=True)
@@ -0,0 +1,64 @@
+import os
+import sqlite3
+import threading
+import time
+
+
+class LeaderLease:
+    """
+    Time-limited leadership lease stored in an SQLite file in the shared directory. Exactly
+    one commander holds it at a time; the holder renews it from a background thread and any
+    other commander can take it over once it has expired.
+    """
+    FILE_NAME = "commander_lease.sqlite3"
+    LEASE_NAME = "scheduler"
+
+    def __init__(self, db_path: str, holder_id: str, ttl: float) -> None:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.holder_id = holder_id
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS lease (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                expires REAL NOT NULL
+            )
+        """)
+
+    def acquire(self) -> bool:
+        """
+        Take or renew the lease. Return False while another holder's lease is still valid,
+        or when the lease file stays locked, since leadership cannot be confirmed then.
+        """
+        with self._lock:
+            now = time.time()
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                row = self._conn.execute("SELECT holder, expires FROM lease WHERE name = ?", (self.LEASE_NAME,)).fetchone()
+                if row is not None and row[0] != self.holder_id and row[1] > now:
+                    self._conn.execute("COMMIT")
+                    return False
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO lease (name, holder, expires) VALUES (?, ?, ?)",
+                    (self.LEASE_NAME, self.holder_id, now + self.ttl)
+                )
+                self._conn.execute("COMMIT")
+                return True
+            except sqlite3.OperationalError:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                return False
+
+    def release(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM lease WHERE name = ? AND holder = ?", (self.LEASE_NAME, self.holder_id))
+
+    def get_holder(self) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT holder FROM lease WHERE name = ? AND expires > ?",
+                (self.LEASE_NAME, time.time())
+            ).fetchone()
+        return row[0] if row is not None else None
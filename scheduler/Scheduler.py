@@ -0,0 +1,71 @@
+from typing import Dict, List, Tuple
+import heapq
+import itertools
+import threading
+import time
+
+
+class Scheduler:
+    """Min-heap of task due times with a wakeup primitive for the commander loop."""
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, str]] = []
+        self._due: Dict[str, float] = {}
+        self._counter = itertools.count()
+        self._wakeup = threading.Condition()
+        self._notified = False
+
+    def schedule(self, task_name: str, due_time: float) -> None:
+        """Schedule (or reschedule) a task. Only the latest due time per task is kept."""
+        with self._wakeup:
+            self._due[task_name] = due_time
+            heapq.heappush(self._heap, (due_time, next(self._counter), task_name))
+            self._wakeup.notify_all()
+
+    def notify(self) -> None:
+        """Wake up the waiting loop, e.g. when a task completion event arrives."""
+        with self._wakeup:
+            self._notified = True
+            self._wakeup.notify_all()
+
+    def wait(self, max_wait: float | None = None) -> List[str]:
+        """
+        Block until at least one task is due, notify() is called or max_wait seconds pass.
+        Returns the names of the due tasks, removed from the schedule, in due order.
+        """
+        deadline = None if max_wait is None else time.time() + max_wait
+        with self._wakeup:
+            while True:
+                now = time.time()
+                due_tasks = self._pop_due(now)
+                if due_tasks or self._notified:
+                    self._notified = False
+                    return due_tasks
+                if deadline is not None and now >= deadline:
+                    return []
+                timeout = self._get_timeout(now, deadline)
+                self._wakeup.wait(timeout)
+
+    def _get_timeout(self, now: float, deadline: float | None) -> float | None:
+        next_due = self._peek()
+        candidates = [t - now for t in (next_due, deadline) if t is not None]
+        return max(0.0, min(candidates)) if candidates else None
+
+    def _peek(self) -> float | None:
+        """Return the earliest live due time, dropping stale heap entries."""
+        while self._heap:
+            due_time, _, task_name = self._heap[0]
+            if self._due.get(task_name) == due_time:
+                return due_time
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now: float) -> List[str]:
+        due_tasks = []
+        while True:
+            due_time = self._peek()
+            if due_time is None or due_time > now:
+                return due_tasks
+            _, _, task_name = heapq.heappop(self._heap)
+            del self._due[task_name]
+            due_tasks.append(task_name)
@@ -0,0 +1,63 @@
+from typing import Dict
+import os
+import sqlite3
+
+
+class StateStore:
+    """SQLite-backed scheduler state that survives commander restarts."""
+    FILE_NAME = "commander_state.sqlite3"
+
+    def __init__(self, db_path: str) -> None:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=10.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS task_runs (
+                    task_name TEXT PRIMARY KEY,
+                    last_start REAL,
+                    last_finish REAL,
+                    exit_code INTEGER
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS running_containers (
+                    task_name TEXT PRIMARY KEY,
+                    container_id TEXT NOT NULL
+                )
+            """)
+
+    def record_start(self, task_name: str, start_time: float) -> None:
+        with self._conn:
+            self._conn.execute("""
+                INSERT INTO task_runs (task_name, last_start) VALUES (?, ?)
+                ON CONFLICT(task_name) DO UPDATE SET last_start = excluded.last_start
+            """, (task_name, start_time))
+
+    def record_finish(self, task_name: str, finish_time: float, exit_code: int | None) -> None:
+        with self._conn:
+            self._conn.execute("""
+                INSERT INTO task_runs (task_name, last_finish, exit_code) VALUES (?, ?, ?)
+                ON CONFLICT(task_name) DO UPDATE SET
+                    last_finish = excluded.last_finish,
+                    exit_code = excluded.exit_code
+            """, (task_name, finish_time, exit_code))
+
+    def get_last_starts(self) -> Dict[str, float]:
+        rows = self._conn.execute("SELECT task_name, last_start FROM task_runs WHERE last_start IS NOT NULL")
+        return {task_name: last_start for task_name, last_start in rows}
+
+    def add_running_container(self, task_name: str, container_id: str) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO running_containers (task_name, container_id) VALUES (?, ?)",
+                (task_name, container_id)
+            )
+
+    def remove_running_container(self, task_name: str) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM running_containers WHERE task_name = ?", (task_name,))
+
+    def get_running_containers(self) -> Dict[str, str]:
+        rows = self._conn.execute("SELECT task_name, container_id FROM running_containers")
+        return {task_name: container_id for task_name, container_id in rows}
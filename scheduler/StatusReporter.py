@@ -0,0 +1,88 @@
+from typing import Any, Dict, List
+import html
+import json
+import os
+import time
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+class StatusReporter:
+    """Writes the commander's own state as a task output so the UI can display it."""
+    NAME = "task_commander"
+    ORDER = -1
+
+    def save(self, admission: Dict[str, Any]) -> None:
+        data = {
+            'admission': admission,
+            'time_elapsed_ms': 0,
+            'time_finish_ms': time.time() * 1000.0,
+            'html_template': 'template/BaseTaskTemplate.html',
+        }
+        output_dir = self._get_output_dir()
+        os.makedirs(output_dir, exist_ok=True)
+        self._write(f"{output_dir}/{self.NAME}.json", json.dumps(data, ensure_ascii=False, indent=2))
+        self._write(f"{output_dir}/{self.NAME}.html", self._html_output(admission))
+        self._write(f"{output_dir}/{self.NAME}.txt", self._text_output(admission))
+
+    def _text_output(self, admission: Dict[str, Any]) -> str:
+        return "cpus %.1f/%.1f, memory %.1f/%.1f GB, running %d, waiting %d" % (
+            admission['reserved_cpus'],
+            admission['capacity_cpus'],
+            admission['reserved_memory_gb'],
+            admission['capacity_memory_gb'],
+            len(admission['reservations']),
+            len(admission['ready']),
+        )
+
+    def _html_output(self, admission: Dict[str, Any]) -> str:
+        return self._render('template/TaskCommander.html', {
+            'progress_bar_cpus': self._render_progress_bar('#4caf50', admission['reserved_cpus'], admission['capacity_cpus']),
+            'progress_bar_memory': self._render_progress_bar('#2196f3', admission['reserved_memory_gb'], admission['capacity_memory_gb']),
+            'reserved_cpus': "%.1f" % admission['reserved_cpus'],
+            'capacity_cpus': "%.1f" % admission['capacity_cpus'],
+            'reserved_memory_gb': "%.1f" % admission['reserved_memory_gb'],
+            'capacity_memory_gb': "%.1f" % admission['capacity_memory_gb'],
+            'reservations': self._render_list(admission['reservations'], 'admitted'),
+            'ready': self._render_list(admission['ready'], 'submitted'),
+        })
+
+    def _render_progress_bar(self, color: str, used: float, total: float) -> str:
+        usage = min(100.0, used / total * 100.0) if total > 0 else 0.0
+        return self._render('template/SystemMonitorProgressBar.html', {
+            'foreground_color': color,
+            'background_color': '#2b2b2b',
+            'height': '16px',
+            'usage': "%.0f" % usage,
+        })
+
+    def _render_list(self, items: Dict[str, Dict[str, Any]], since_key: str) -> str:
+        rows: List[str] = []
+        for task_name, item in items.items():
+            rows.append(self._render('template/TaskCommanderRow.html', {
+                'task_name': html.escape(task_name),
+                'cpus': "%.1f" % item['cpus'],
+                'memory_gb': "%.1f" % item['memory_gb'],
+                'since': time.strftime(TIME_FORMAT, time.localtime(item[since_key])),
+            }))
+        return self._render('template/TaskCommanderList.html', {'rows': "\n".join(rows)})
+
+    def _render(self, template_name: str, replacements: Dict[str, Any]) -> str:
+        template_path = f"{self._get_commander_dir()}/task/{template_name}"
+        with open(template_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for key, value in replacements.items():
+            content = content.replace("{{" + key + "}}", str(value))
+        return content.strip()
+
+    def _write(self, path: str, content: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def _get_output_dir(self) -> str:
+        return f"{self._get_commander_dir()}/tmp/output"
+
+    def _get_commander_dir(self) -> str:
+        scheduler_dir = os.path.dirname(os.path.abspath(__file__))
+        return os.path.dirname(scheduler_dir)
@@ -16,6 +16,7 @@ class ModelFactory:
         Initialize ModelFactory.
         """
         self._print_fn = print_fn
+        self._models = {}
 
     def _print(self, message: str) -> None:
         """Print message using provided print function."""
@@ -42,10 +43,14 @@ class ModelFactory:
         return self._get_or_download_default_model()
 
     def _load_model(self, llm_model_path: str, carry: Dict[str, Any]):
-        """Load and initialize the LLM model."""
+        """Load and initialize the LLM model, reusing it when the factory outlives a run (resident workers)."""
         from llama_cpp import Llama
         max_context_tokens = int(carry.get('max_context_tokens', 2048))
         n_gpu_layers = int(carry.get('n_gpu_layers', 0))
+        cache_key = (llm_model_path, max_context_tokens, n_gpu_layers)
+        if cache_key in self._models:
+            self._print(f"Reusing loaded model: {llm_model_path}")
+            return self._models[cache_key]
         self._print(f"Loading model: {llm_model_path}")
         try:
             llm = Llama(
@@ -55,6 +60,7 @@ class ModelFactory:
                 verbose = True,
             )
             self._print(f"Model loaded successfully: {llm_model_path}")
+            self._models[cache_key] = llm
             return llm
         except Exception as e:
             import traceback
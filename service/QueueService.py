@@ -1,10 +1,25 @@
+from collections import deque
+from typing import Deque, Dict, List, Tuple
 import json
 import os
-from typing import List
 
 
 class QueueService:
-    """Service for managing persistent queue operations."""
+    """
+    Service for managing persistent queue operations.
+
+    The queue file is an append-only journal. A line holding a JSON array is a snapshot
+    of the whole queue, and the object lines after it are push and pop operations. Once
+    the journal holds more operations than live items, it is compacted into a single
+    snapshot, written to a temporary file and atomically renamed over the journal.
+    Replaying stops at a torn last line, so a crash mid-append loses at most that
+    operation. Files written by the old format, one JSON array per line, replay as
+    snapshots, and malformed records are skipped. The replayed queue is cached per
+    process and revalidated against the journal's inode, mtime and size, so pop and
+    size are O(1) amortized.
+    """
+    COMPACT_MIN_OPS = 1000
+    _cache: Dict[str, Tuple[Deque[str], int, Tuple[int, int, int] | None]] = {}
     
     @staticmethod
     def get_queue_file_path(task_name: str, outdir: str) -> str:
@@ -26,8 +41,7 @@ class QueueService:
     @staticmethod
     def read_queue(queue_file: str) -> List[str]:
         """
-        Read the queue from queue.txt. Returns empty list if file doesn't exist.
-        The last line contains the current queue as a JSON array.
+        Read the queue from the journal. Returns empty list if file doesn't exist.
         
         Args:
             queue_file: Path to the queue file
@@ -35,36 +49,59 @@ class QueueService:
         Returns:
             List of items in the queue
         """
-        if not os.path.exists(queue_file):
-            return []
         try:
-            with open(queue_file, 'r') as f:
-                content = f.read().strip()
-                if not content:
-                    return []
-                # The last line contains the current queue as a JSON array
-                lines = content.split('\n')
-                if lines:
-                    return json.loads(lines[-1])
-                return []
+            return list(QueueService._load(queue_file)[0])
         except Exception:
             return []
     
     @staticmethod
     def write_queue(queue_file: str, queue: List[str]) -> None:
         """
-        Write the queue to queue.txt as a JSON array on a new line.
+        Replace the whole queue with a compacted snapshot.
         
         Args:
             queue_file: Path to the queue file
             queue: List of items to write to the queue
         """
         try:
-            with open(queue_file, 'a') as f:
-                f.write(json.dumps(queue) + '\n')
+            QueueService._compact(queue_file, deque(queue))
         except Exception:
             pass
     
+    @staticmethod
+    def push(queue_file: str, items: List[str]) -> None:
+        """
+        Append items to the end of the queue.
+        
+        Args:
+            queue_file: Path to the queue file
+            items: Items to append
+        """
+        queue, ops, _ = QueueService._load(queue_file)
+        records = [{"op": "push", "item": item} for item in items]
+        QueueService._append(queue_file, records, queue, ops)
+        queue.extend(items)
+        QueueService._maybe_compact(queue_file)
+    
+    @staticmethod
+    def pop(queue_file: str) -> str | None:
+        """
+        Remove and return the first item from the queue.
+        
+        Args:
+            queue_file: Path to the queue file
+        
+        Returns:
+            The popped item, or None if the queue was empty
+        """
+        queue, ops, _ = QueueService._load(queue_file)
+        if not queue:
+            return None
+        QueueService._append(queue_file, [{"op": "pop"}], queue, ops)
+        item = queue.popleft()
+        QueueService._maybe_compact(queue_file)
+        return item
+    
     @staticmethod
     def pop_first(queue_file: str) -> tuple[List[str], str | None]:
         """
@@ -76,14 +113,8 @@ class QueueService:
         Returns:
             Tuple of (updated queue, popped item or None if queue was empty)
         """
-        queue = QueueService.read_queue(queue_file)
-        if not queue:
-            return ([], None)
-        
-        first_item = queue[0]
-        remaining_queue = queue[1:]
-        QueueService.write_queue(queue_file, remaining_queue)
-        return (remaining_queue, first_item)
+        first_item = QueueService.pop(queue_file)
+        return (QueueService.read_queue(queue_file), first_item)
     
     @staticmethod
     def initialize_queue(queue_file: str, items: List[str]) -> None:
@@ -107,7 +138,7 @@ class QueueService:
         Returns:
             Number of items in the queue
         """
-        return len(QueueService.read_queue(queue_file))
+        return len(QueueService._load(queue_file)[0])
     
     @staticmethod
     def merge_and_filter_queue(queue_file: str, new_items: List[str], filter_func=None) -> List[str]:
@@ -124,9 +155,83 @@ class QueueService:
                 existing_set.add(item)
         if filter_func:
             merged = [item for item in merged if filter_func(item)]
-        QueueService.write_queue(queue_file, merged)
+        if merged[:len(existing_queue)] == existing_queue:
+            # Only new items were added: journal them instead of rewriting the queue
+            QueueService.push(queue_file, merged[len(existing_queue):])
+        else:
+            QueueService.write_queue(queue_file, merged)
         return merged
     
+    @staticmethod
+    def _load(queue_file: str) -> Tuple[Deque[str], int, Tuple[int, int, int] | None]:
+        """Return the cached (queue, journaled ops, journal stat), replaying the journal if another process changed it."""
+        stat = QueueService._stat(queue_file)
+        cached = QueueService._cache.get(queue_file)
+        if cached is not None and cached[2] == stat:
+            return cached
+        queue: Deque[str] = deque()
+        ops = 0
+        is_torn = False
+        if stat is not None and stat[2] > 0:
+            with open(queue_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        is_torn = True  # torn write from a crash
+                        break
+                    if isinstance(record, list):
+                        queue = deque(record)
+                        ops = 0
+                    elif not isinstance(record, dict):
+                        continue
+                    elif record.get("op") == "push" and isinstance(record.get("item"), str):
+                        queue.append(record["item"])
+                        ops += 1
+                    elif record.get("op") == "pop":
+                        if queue:
+                            queue.popleft()
+                        ops += 1
+        QueueService._cache[queue_file] = (queue, ops, stat)
+        if is_torn:
+            # Drop the torn line so that later appends are not glued to it
+            QueueService._compact(queue_file, queue)
+        return QueueService._cache[queue_file]
+    
+    @staticmethod
+    def _append(queue_file: str, records: List[dict], queue: Deque[str], ops: int) -> None:
+        if not records:
+            return
+        with open(queue_file, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(record) + '\n' for record in records))
+        QueueService._cache[queue_file] = (queue, ops + len(records), QueueService._stat(queue_file))
+    
+    @staticmethod
+    def _maybe_compact(queue_file: str) -> None:
+        queue, ops, _ = QueueService._cache[queue_file]
+        if ops > max(QueueService.COMPACT_MIN_OPS, len(queue)):
+            QueueService._compact(queue_file, queue)
+    
+    @staticmethod
+    def _compact(queue_file: str, queue: Deque[str]) -> None:
+        """Write the queue as a single snapshot line and atomically swap it in for the journal."""
+        tmp_file = f"{queue_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(list(queue)) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, queue_file)
+        QueueService._cache[queue_file] = (queue, 0, QueueService._stat(queue_file))
+
+    @staticmethod
+    def _stat(queue_file: str) -> Tuple[int, int, int] | None:
+        """Identify the journal version: a compaction by another process replaces the inode even when the size matches."""
+        try:
+            stat = os.stat(queue_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
     @staticmethod
     def build_queue(
         queue_file: str,
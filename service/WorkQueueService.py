@@ -0,0 +1,100 @@
+from typing import List
+import os
+import socket
+import sqlite3
+import time
+
+
+class WorkQueueService:
+    """
+    SQLite work queue that several processes or containers of the same task can drain in
+    parallel. A consumer claims items under a lease and acks them when done; items whose
+    lease expires, because their consumer crashed or was killed, are handed out again.
+    """
+    FILE_NAME = "work_queue.sqlite3"
+    LEASE_SECONDS = 30 * 60
+
+    @staticmethod
+    def get_db_path(task_name: str, outdir: str) -> str:
+        """Path of the task's work queue, next to its journaled queue file in var/<task_name>."""
+        commander_dir = os.path.dirname(outdir)
+        queue_dir = os.path.join(commander_dir, "var", task_name)
+        os.makedirs(queue_dir, exist_ok=True)
+        return os.path.join(queue_dir, WorkQueueService.FILE_NAME)
+
+    @staticmethod
+    def get_consumer_id() -> str:
+        """Unique per process, and per container since containers get their own hostname."""
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def __init__(self, db_path: str, lease_seconds: float = LEASE_SECONDS) -> None:
+        self.lease_seconds = lease_seconds
+        self._conn = sqlite3.connect(db_path, timeout=30.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS items (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                item TEXT NOT NULL UNIQUE,
+                consumer TEXT,
+                lease_expires REAL
+            )
+        """)
+
+    def add(self, items: List[str]) -> int:
+        """Enqueue the items that are not queued or claimed yet, keeping their order. Return how many were added."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            added = 0
+            for item in items:
+                added += self._conn.execute("INSERT OR IGNORE INTO items (item) VALUES (?)", (item,)).rowcount
+            self._conn.execute("COMMIT")
+            return added
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def claim(self, consumer: str, count: int = 1) -> List[str]:
+        """Lease up to count items that are unclaimed or whose lease has expired, oldest first."""
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self._conn.execute("""
+                SELECT seq, item FROM items
+                WHERE consumer IS NULL OR lease_expires < ?
+                ORDER BY seq LIMIT ?
+            """, (now, count)).fetchall()
+            self._conn.executemany(
+                "UPDATE items SET consumer = ?, lease_expires = ? WHERE seq = ?",
+                [(consumer, now + self.lease_seconds, seq) for seq, _ in rows]
+            )
+            self._conn.execute("COMMIT")
+            return [item for _, item in rows]
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def ack(self, item: str, consumer: str) -> bool:
+        """Remove a finished item. Return False if the lease was lost to another consumer."""
+        cursor = self._conn.execute("DELETE FROM items WHERE item = ? AND consumer = ?", (item, consumer))
+        return cursor.rowcount > 0
+
+    def release(self, item: str, consumer: str) -> None:
+        """Put a claimed item back on the queue without waiting for its lease to expire."""
+        self._conn.execute(
+            "UPDATE items SET consumer = NULL, lease_expires = NULL WHERE item = ? AND consumer = ?",
+            (item, consumer)
+        )
+
+    def renew(self, items: List[str], consumer: str) -> None:
+        """Extend the leases of items that take longer than lease_seconds to process."""
+        self._conn.executemany(
+            "UPDATE items SET lease_expires = ? WHERE item = ? AND consumer = ?",
+            [(time.time() + self.lease_seconds, item, consumer) for item in items]
+        )
+
+    def size(self) -> int:
+        """Number of items not acked yet, claimed or not."""
+        return self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
@@ -1,12 +1,7 @@
-from bs4 import BeautifulSoup
 from datetime import datetime
 from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from task.BaseTask import BaseTask
 from typing import Any, Dict
-from webdriver_manager.chrome import ChromeDriverManager
 import os
 import time
 
@@ -21,6 +16,10 @@ class BaseSeleniumTask(BaseTask):
         super().__init__()
 
     def run(self, carry: Dict[str, Any]) -> Dict[str, Any]:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
         try:
             dir_root = carry.get('outdir')
             date_time = datetime.now().strftime("%Y-%m-%d %H-%M-%S")
@@ -84,6 +83,7 @@ class BaseSeleniumTask(BaseTask):
         html = data.get('html', '')
         if not html:
             return ''
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(html, 'html.parser')
         body = soup.find('body')
         return body.text
@@ -92,6 +92,7 @@ class BaseSeleniumTask(BaseTask):
         html = data.get('html', '')
         if not html:
             return ''
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(html, 'html.parser')
         body = soup.find('body')
         return body.html
@@ -16,6 +16,28 @@ class BaseTask(TaskInterface):
     def dependencies(self) -> Dict[str, Any]:
         return {}
 
+    def depends_on(self) -> List[str]:
+        return []
+
+    def shard(self, params: Dict[str, Any], count: int) -> List[Dict[str, Any]]:
+        return [params]
+
+    def merge(self, outputs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Generic merge: lists are concatenated, integer counters are summed and any
+        other value is taken from the first shard that has it.
+        """
+        merged: Dict[str, Any] = {}
+        for output in outputs:
+            for key, value in output.items():
+                if key not in merged:
+                    merged[key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list) and isinstance(merged[key], list):
+                    merged[key].extend(value)
+                elif isinstance(value, int) and not isinstance(value, bool) and type(merged[key]) is int:
+                    merged[key] += value
+        return merged
+
     def volumes(self, params: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
         return {}
 
@@ -34,6 +56,12 @@ class BaseTask(TaskInterface):
     def max_time_expected(self) -> float | None:
         return None
 
+    def jitter(self) -> float:
+        return 0.0
+
+    def retry_policy(self) -> Dict[str, Any]:
+        return {"max_attempts": 1, "base_delay": 30.0, "jitter": 0.2}
+
     def revive(self) -> bool:
         return False
 
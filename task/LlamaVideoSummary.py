@@ -124,6 +124,12 @@ class LlamaVideoSummary(BaseTask):
     def interval(self) -> int:
         return 60 * 60
 
+    def jitter(self) -> float:
+        return 5 * 60.0
+
+    def depends_on(self) -> List[str]:
+        return ["whisper_subtitles"]
+
     def cpus(self) -> float:
         return 20.0
 
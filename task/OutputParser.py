@@ -62,6 +62,26 @@ class OutputParser:
         except Exception:
             return {}
 
+    def save(self, task_name: str, data: Dict[str, Any], text: str, html: str) -> None:
+        """
+        Write {task_name}.json, .txt and .html as TaskLauncher does, for outputs assembled by the commander.
+        """
+        with open(self.__get_path(f"output/{task_name}.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(self.__get_path(f"output/{task_name}.txt"), "w", encoding="utf-8") as f:
+            f.write(text)
+        with open(self.__get_path(f"output/{task_name}.html"), "w", encoding="utf-8") as f:
+            f.write(html)
+
+    def remove(self, task_name: str) -> None:
+        """
+        Delete the output files of {task_name}, if any.
+        """
+        for extension in ("json", "txt", "html"):
+            path = self.__get_path(f"output/{task_name}.{extension}")
+            if os.path.exists(path):
+                os.remove(path)
+
     def _load_task_executions(self, tasks_output: Dict[str, dict]) -> Dict[str, dict]:
         tasks = {}
         for task_name, output in tasks_output.items():
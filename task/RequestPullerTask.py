@@ -53,6 +53,9 @@ class RequestPullerTask(BaseTask):
     def requires_connection(self) -> bool:
         return True
 
+    def retry_policy(self) -> Dict[str, Any]:
+        return {"max_attempts": 4, "base_delay": 5.0, "jitter": 0.5}
+
     def max_time_expected(self) -> float | None:
         return self._timeout + 2.0
 
@@ -1,5 +1,3 @@
-from scenedetect import SceneManager, open_video
-from scenedetect.detectors import ContentDetector
 from task.BaseTask import BaseTask
 from typing import Any, Dict, List, Tuple
 import html
@@ -125,6 +123,19 @@ class SceneChangeDetectorTask(BaseTask):
             self._print(f"Traceback: {traceback.format_exc()}")
             return {"error": str(e), "files": []}
 
+    def shard(self, params: Dict[str, Any], count: int) -> List[Dict[str, Any]]:
+        """
+        Collect the video files on the host and deal them round-robin into shards.
+        Inputs that cannot be collected go to the first shard so they are still reported.
+        """
+        inputs = [str(p).strip() for p in params.get("video_paths", []) or [] if str(p).strip()]
+        files, skips = self._collect_video_files(inputs, bool(params.get("recursive", True)), False, params)
+        if len(files) < 2:
+            return [params]
+        shards = [{**params, "video_paths": files[i::count]} for i in range(min(count, len(files)))]
+        shards[0]["video_paths"] = shards[0]["video_paths"] + [skip["path"] for skip in skips]
+        return shards
+
     def text_output(self, data: Dict[str, Any]) -> str:
         if 'error' in data and not data.get('files'):
             return f"error: {data['error']}"
@@ -212,6 +223,9 @@ class SceneChangeDetectorTask(BaseTask):
     def interval(self) -> int:
         return 60 * 60
 
+    def jitter(self) -> float:
+        return 5 * 60.0
+
     def name(self) -> str:
         return "scene_change_detector"
 
@@ -329,6 +343,8 @@ class SceneChangeDetectorTask(BaseTask):
         return sorted(found), skips
 
     def _detect_scenes(self, video_path: str, threshold: float) -> List[Tuple[Any, Any]]:
+        from scenedetect import SceneManager, open_video
+        from scenedetect.detectors import ContentDetector
         video = open_video(video_path)
         manager = SceneManager()
         manager.add_detector(ContentDetector(threshold=threshold))
@@ -1,4 +1,3 @@
-import cv2
 import html
 import json
 import os
@@ -21,7 +20,14 @@ class SceneFrameExtractorTask(BaseTask):
     def interval(self) -> int | None:
         return 60 * 60
 
+    def jitter(self) -> float:
+        return 5 * 60.0
+
+    def depends_on(self) -> List[str]:
+        return ["scene_change_detector"]
+
     def run(self, carry: Dict[str, Any]) -> Dict[str, Any]:
+        import cv2
         try:
             video_paths_raw = carry.get("video_paths", [])
             if not isinstance(video_paths_raw, list) or len(video_paths_raw) == 0:
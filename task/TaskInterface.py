@@ -58,6 +58,28 @@ class TaskInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def depends_on(self) -> List[str]:
+        """
+        Return the names of upstream tasks whose successful completion triggers this task.
+        """
+        pass
+
+    @abstractmethod
+    def shard(self, params: Dict[str, Any], count: int) -> List[Dict[str, Any]]:
+        """
+        Split the run parameters into at most count parameter sets over disjoint inputs.
+        Return [params] if the task cannot be sharded.
+        """
+        pass
+
+    @abstractmethod
+    def merge(self, outputs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge the outputs of the shards of a run into a single task output.
+        """
+        pass
+
     @abstractmethod
     def volumes(self, params: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
         """
@@ -100,6 +122,20 @@ class TaskInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def jitter(self) -> float:
+        """
+        Return the maximum random delay in seconds added to each scheduled run.
+        """
+        pass
+
+    @abstractmethod
+    def retry_policy(self) -> Dict[str, Any]:
+        """
+        Return how failed runs are retried: {"max_attempts": int, "base_delay": secs, "jitter": fraction}.
+        """
+        pass
+
     @abstractmethod
     def revive(self) -> bool:
         """
@@ -0,0 +1,43 @@
+from task.TaskInterface import TaskInterface
+from typing import List
+import importlib
+
+
+class TaskRegistry:
+    """
+    Declarative map of task names to the modules that define them, so run.py only imports
+    the task modules it actually uses. Task modules defer their heavy imports (whisper,
+    cv2, scenedetect, yt_dlp, selenium, llama_cpp) to the code that runs the task, which
+    keeps importing and instantiating a task cheap for the commander.
+    """
+    TASKS = {
+        "dir_manager": "task.DirManager",
+        "dir_observer": "task.DirObserver",
+        "flask_task": "task.FlaskTask",
+        "llama_llm": "task.LlamaLLM",
+        "llama_video_summary": "task.LlamaVideoSummary",
+        "ncommander_ui": "task.UiFlask",
+        "random_messager": "task.Message",
+        "request_puller": "task.RequestPullerTask",
+        "scene_change_detector": "task.SceneChangeDetectorTask",
+        "scene_frame_extractor": "task.SceneFrameExtractorTask",
+        "system_monitor": "task.SystemMonitor",
+        "task_data": "task.TaskData",
+        "thumbnail_creator": "task.ThumbnailCreatorTask",
+        "whisper_subtitles": "task.WhisperSubtitleTask",
+        "youtube_channel_scanner": "task.YouTubeChannelScannerTask",
+        "youtube_downloader": "task.YouTubeDownloader",
+        "youtube_scanner": "task.YouTubeScannerTask",
+    }
+
+    @staticmethod
+    def get(name: str) -> TaskInterface:
+        if name not in TaskRegistry.TASKS:
+            raise KeyError(f"Unknown task '{name}', known tasks: {', '.join(TaskRegistry.names())}")
+        module_path = TaskRegistry.TASKS[name]
+        module = importlib.import_module(module_path)
+        return getattr(module, module_path.split('.')[-1])()
+
+    @staticmethod
+    def names() -> List[str]:
+        return sorted(TaskRegistry.TASKS)
@@ -1,10 +1,14 @@
-from PIL import Image
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from service.QueueService import QueueService
+from service.WorkQueueService import WorkQueueService
 from task.BaseTask import BaseTask
 from typing import Any, Dict, List
 import html
 import os
+import shutil
 import subprocess
+import time
 
 VIDEO_EXTENSIONS = {
     ".mp4", ".mkv", ".mov", ".avi", ".webm",
@@ -13,6 +17,12 @@ VIDEO_EXTENSIONS = {
 
 class ThumbnailCreatorTask(BaseTask):
     INTERVAL_MS = 5000
+    BATCH_SIZE = 10
+    BATCH_SECONDS = 10 * 60
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._work_queue = None
 
     def name(self) -> str:
         return "thumbnail_creator"
@@ -20,16 +30,21 @@ class ThumbnailCreatorTask(BaseTask):
     def memory_gb(self) -> float:
         return 4.0
 
+    def cpus(self) -> float:
+        return 2.0
+
     def interval(self) -> int | None:
         return 60 * 60
 
+    def jitter(self) -> float:
+        return 5 * 60.0
+
     def revive(self) -> bool:
         return True
 
     def run(self, carry: Dict[str, Any]) -> Dict[str, Any]:
         try:
             dir_root = str(carry.get("outdir", "/app/tmp"))
-            queue_file = QueueService.get_queue_file_path(self.name(), dir_root)
             in_container = bool(carry.get("in_container", False))
             
             # Validate input parameters
@@ -37,36 +52,91 @@ class ThumbnailCreatorTask(BaseTask):
             if not isinstance(video_paths_raw, list) or len(video_paths_raw) == 0:
                 return {"error": "video_paths is required and must be a non-empty list", "files": [], "queue_remaining": 0}
             
-            # Build queue using QueueService
-            queue, collection_info = QueueService.build_queue(
-                queue_file=queue_file,
-                collect_func=lambda: self._collect_video_files(
-                    [str(p).strip() for p in video_paths_raw if str(p).strip()],
-                    bool(carry.get("recursive", True)),
-                    in_container,
-                    carry
-                ),
-                filter_func=lambda path: self._should_process_video(path, dir_root, in_container, carry),
-                print_func=self._print
+            # Build the queue: the journaled queue.txt by default, or with work_queue=True the
+            # leased SQLite work queue that several concurrent runs (shards) can drain together
+            use_work_queue = bool(carry.get("work_queue", False))
+            queue_file = QueueService.get_queue_file_path(self.name(), dir_root)
+            work_queue = self._get_work_queue(dir_root) if use_work_queue else None
+            consumer = WorkQueueService.get_consumer_id()
+            collected, skips = self._collect_video_files(
+                [str(p).strip() for p in video_paths_raw if str(p).strip()],
+                bool(carry.get("recursive", True)),
+                in_container,
+                carry
             )
+            self._print(f"collection: items={len(collected)}, skips={len(skips)}")
+            if use_work_queue:
+                added = work_queue.add([path for path in collected if self._should_process_video(path, dir_root, in_container, carry)])
+                queue_size = work_queue.size()
+                self._print(f"Queue merged and filtered: {added} added, {queue_size} items remaining")
+                pending = deque()
+            else:
+                pending = deque(QueueService.merge_and_filter_queue(
+                    queue_file,
+                    collected,
+                    lambda path: self._should_process_video(path, dir_root, in_container, carry)
+                ))
+                queue_size = len(pending)
+                self._print(f"Queue merged and filtered: {queue_size} items remaining")
             
-            if not queue and collection_info["collected"] == 0:
+            if queue_size == 0 and len(collected) == 0:
                 return {
                     "error": "no valid video files found",
-                    "files": collection_info["skip_details"],
-                    "skipped": collection_info["skips"],
+                    "files": skips,
+                    "skipped": len(skips),
                     "queue_remaining": 0
                 }
             
             interval_ms = int(carry.get("interval_ms", self.INTERVAL_MS))
             if interval_ms <= 0:
-                return {"error": "interval_ms must be a positive integer", "files": [], "queue_remaining": len(queue)}
+                return {"error": "interval_ms must be a positive integer", "files": [], "queue_remaining": queue_size}
 
             self._print(f"params: in_container={in_container}, interval_ms={interval_ms}")
-            self._print(f"Queue status: {len(queue)} videos remaining")
+            self._print(f"Queue status: {queue_size} videos remaining")
             
-            # Process only the first video in the queue
-            if not queue:
+            # Process a batch of videos, several at a time, from the shared queue
+            batch_size = int(carry.get("batch_size", self.BATCH_SIZE))
+            batch_seconds = float(carry.get("batch_seconds", self.BATCH_SECONDS))
+            workers = max(1, min(int(self.cpus()), batch_size))
+            deadline = time.time() + batch_seconds
+            results = []
+            in_flight = {}
+            claimed_count = 0
+            # Journal mode: videos are popped from the head of queue.txt in claim order, once every video before them is done
+            claim_order = deque()
+            done_paths = set()
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                while True:
+                    while len(in_flight) < workers and claimed_count < batch_size and time.time() < deadline:
+                        claimed = work_queue.claim(consumer) if use_work_queue else [pending.popleft()] if pending else []
+                        if not claimed:
+                            break
+                        claim_order.append(claimed[0])
+                        claimed_count += 1
+                        host_video_path = claimed[0]
+                        self._print(f"processing [{claimed_count}/{min(batch_size, queue_size)}]: {host_video_path}")
+                        future = executor.submit(self._process_video, host_video_path, dir_root, interval_ms, in_container, carry)
+                        in_flight[future] = host_video_path
+                    if not in_flight:
+                        break
+                    # Wake up well within the lease, so long extractions keep their leases
+                    lease_timeout = work_queue.lease_seconds / 3 if use_work_queue else None
+                    done, _ = wait(in_flight, timeout=lease_timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        host_video_path = in_flight.pop(future)
+                        results.append(future.result())
+                        # Remove each processed video from the queue right away, so a killed run only repeats its in-flight videos
+                        if not use_work_queue:
+                            done_paths.add(host_video_path)
+                            while claim_order and claim_order[0] in done_paths:
+                                done_paths.discard(claim_order.popleft())
+                                QueueService.pop(queue_file)
+                        elif not work_queue.ack(host_video_path, consumer):
+                            self._print(f"lease on {host_video_path} was lost, another run may process it again")
+                    if use_work_queue:
+                        work_queue.renew(list(in_flight.values()), consumer)
+
+            if claimed_count == 0:
                 return {
                     "files": [],
                     "processed": 0,
@@ -74,112 +144,20 @@ class ThumbnailCreatorTask(BaseTask):
                     "failed": 0,
                     "files_count": 0,
                     "interval_ms": interval_ms,
-                    "queue_remaining": 0,
-                    "message": "Queue is empty"
+                    "queue_remaining": queue_size,
+                    "message": "Queue is empty" if queue_size == 0 else "All queued videos are claimed by other runs"
                 }
-            
-            host_video_path = queue[0]
-            results = []
-            processed = 0
-            skipped = 0
-            failed = 0
-            
-            try:
-                self._print(f"processing [1/{len(queue)}]: {host_video_path}")
-                mapped_video_path = self._map_host_to_container_file(host_video_path, carry) if in_container else host_video_path
-                
-                if not os.path.exists(mapped_video_path):
-                    skipped += 1
-                    results.append({
-                        "path": host_video_path,
-                        "status": "skipped",
-                        "reason": "video does not exist or is not mounted"
-                    })
-                else:
-                    dir_root = str(carry.get("outdir", "/app/tmp"))
-                    frames_dir_container = self._derive_output_frames_dir(dir_root, mapped_video_path)
-                    frames_dir_host = self._map_container_to_host_file(frames_dir_container, carry) if in_container else frames_dir_container
-                    
-                    # Skip if output folder exists and contains thumbnails
-                    if os.path.exists(frames_dir_container):
-                        try:
-                            existing_frames = [f for f in os.listdir(frames_dir_container) if f.endswith('.jpg')]
-                            if len(existing_frames) > 0:
-                                skipped += 1
-                                results.append({
-                                    "path": host_video_path,
-                                    "status": "skipped",
-                                    "reason": f"frames already exist ({len(existing_frames)})",
-                                    "frames_dir": frames_dir_host,
-                                    "frames": len(existing_frames)
-                                })
-                                self._print(f"Skipping {mapped_video_path}: frames already exist ({len(existing_frames)})")
-                            else:
-                                # Folder exists but is empty, process it
-                                os.makedirs(frames_dir_container, exist_ok=True)
-                                exported = self._extract_frames_ffmpeg(mapped_video_path, frames_dir_container, interval_ms)
-                                
-                                if exported > 0:
-                                    processed += 1
-                                    results.append({
-                                        "path": host_video_path,
-                                        "status": "success",
-                                        "frames_dir": frames_dir_host,
-                                        "frames": exported
-                                    })
-                                else:
-                                    failed += 1
-                                    results.append({
-                                        "path": host_video_path,
-                                        "status": "error",
-                                        "error": "no frames extracted"
-                                    })
-                        except Exception as e:
-                            self._print(f"Error checking existing frames: {str(e)}")
-                            failed += 1
-                            results.append({
-                                "path": host_video_path,
-                                "status": "error",
-                                "error": str(e)
-                            })
-                    else:
-                        # Create folder and process
-                        os.makedirs(frames_dir_container, exist_ok=True)
-                        exported = self._extract_frames_ffmpeg(mapped_video_path, frames_dir_container, interval_ms)
-                        
-                        if exported > 0:
-                            processed += 1
-                            results.append({
-                                "path": host_video_path,
-                                "status": "success",
-                                "frames_dir": frames_dir_host,
-                                "frames": exported
-                            })
-                        else:
-                            failed += 1
-                            results.append({
-                                "path": host_video_path,
-                                "status": "error",
-                                "error": "no frames extracted"
-                            })
-            
-            except Exception as e:
-                self._print(f"error processing {host_video_path}: {str(e)}")
-                failed += 1
-                results.append({
-                    "path": host_video_path,
-                    "status": "error",
-                    "error": str(e)
-                })
-            
-            # Remove processed video from queue
-            queue, _ = QueueService.pop_first(queue_file)
-            self._print(f"Updated queue: {len(queue)} videos remaining")
+
+            processed = len([result for result in results if result["status"] == "success"])
+            skipped = len([result for result in results if result["status"] == "skipped"])
+            failed = len([result for result in results if result["status"] == "error"])
+            queue_remaining = work_queue.size() if use_work_queue else QueueService.get_queue_size(queue_file)
+            self._print(f"Updated queue: {queue_remaining} videos remaining")
 
             # Calculate progress percentages for template
             completed_count = processed + skipped
             failed_count = failed
-            pending_count = len(queue)
+            pending_count = queue_remaining
             total = completed_count + failed_count + pending_count
             
             if total > 0:
@@ -208,11 +186,11 @@ class ThumbnailCreatorTask(BaseTask):
                 "failed": failed,
                 "files_count": len(results),
                 "interval_ms": interval_ms,
-                "queue_remaining": len(queue),
+                "queue_remaining": queue_remaining,
                 "progress_percentage": completed_percentage,
                 "progress_bar": progress_bar_html,
             }
-            self._print(f"summary: processed={processed}, skipped={skipped}, failed={failed}, queue_remaining={len(queue)}, progress={completed_percentage}%")
+            self._print(f"summary: processed={processed}, skipped={skipped}, failed={failed}, queue_remaining={queue_remaining}, progress={completed_percentage}%")
             return summary
         except Exception as e:
             import traceback
@@ -323,6 +301,7 @@ class ThumbnailCreatorTask(BaseTask):
         }
 
     def _create_thumbnail(self, source_path: str, max_width: int = 120) -> str:
+        from PIL import Image
         try:
             base_name = os.path.basename(source_path)
             name_without_ext = os.path.splitext(base_name)[0]
@@ -388,6 +367,88 @@ class ThumbnailCreatorTask(BaseTask):
             self._print(f"Error extracting frames: {str(e)}")
             return 0
 
+    def _process_video(self, host_video_path: str, dir_root: str, interval_ms: int, in_container: bool, carry: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the thumbnails of one video. Returns its result entry, with a success, skipped or error status."""
+        try:
+            mapped_video_path = self._map_host_to_container_file(host_video_path, carry) if in_container else host_video_path
+            if not os.path.exists(mapped_video_path):
+                return {
+                    "path": host_video_path,
+                    "status": "skipped",
+                    "reason": "video does not exist or is not mounted"
+                }
+            frames_dir_container = self._derive_output_frames_dir(dir_root, mapped_video_path)
+            frames_dir_host = self._map_container_to_host_file(frames_dir_container, carry) if in_container else frames_dir_container
+
+            # Skip if output folder exists and contains thumbnails
+            if os.path.exists(frames_dir_container):
+                existing_frames = [f for f in os.listdir(frames_dir_container) if f.endswith('.jpg')]
+                if len(existing_frames) > 0:
+                    self._print(f"Skipping {mapped_video_path}: frames already exist ({len(existing_frames)})")
+                    return {
+                        "path": host_video_path,
+                        "status": "skipped",
+                        "reason": f"frames already exist ({len(existing_frames)})",
+                        "frames_dir": frames_dir_host,
+                        "frames": len(existing_frames)
+                    }
+
+            # Extract into a partial dir and move it in place once done, so frames left by a killed
+            # run are discarded instead of making the video look processed
+            partial_dir = f"{frames_dir_container}.partial"
+            shutil.rmtree(partial_dir, ignore_errors=True)
+            os.makedirs(partial_dir, exist_ok=True)
+            exported = self._extract_frames_ffmpeg(mapped_video_path, partial_dir, interval_ms)
+            if exported > 0:
+                shutil.rmtree(frames_dir_container, ignore_errors=True)
+                os.rename(partial_dir, frames_dir_container)
+                return {
+                    "path": host_video_path,
+                    "status": "success",
+                    "frames_dir": frames_dir_host,
+                    "frames": exported
+                }
+            shutil.rmtree(partial_dir, ignore_errors=True)
+            return {
+                "path": host_video_path,
+                "status": "error",
+                "error": "no frames extracted"
+            }
+        except Exception as e:
+            self._print(f"error processing {host_video_path}: {str(e)}")
+            return {
+                "path": host_video_path,
+                "status": "error",
+                "error": str(e)
+            }
+
+    def shard(self, params: Dict[str, Any], count: int) -> List[Dict[str, Any]]:
+        """Shards share the parameters and drain the same work queue; the journaled queue has a single consumer."""
+        if not params.get("work_queue", False):
+            return [params]
+        return [dict(params) for _ in range(count)]
+
+    def merge(self, outputs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        merged = super().merge(outputs)
+        for key in ("interval_ms", "queue_remaining", "progress_percentage"):
+            values = [output[key] for output in outputs if key in output]
+            if values:
+                merged[key] = min(values) if key == "queue_remaining" else max(values)
+        return merged
+
+    def _get_work_queue(self, dir_root: str) -> WorkQueueService:
+        """Open the work queue once per task instance, taking over the items of the journaled queue.txt."""
+        if self._work_queue is None:
+            self._work_queue = WorkQueueService(WorkQueueService.get_db_path(self.name(), dir_root))
+            queue_file = QueueService.get_queue_file_path(self.name(), dir_root)
+            if os.path.exists(queue_file):
+                self._work_queue.add(QueueService.read_queue(queue_file))
+                try:
+                    os.remove(queue_file)
+                except FileNotFoundError:
+                    pass
+        return self._work_queue
+
     def _should_process_video(self, host_video_path: str, dir_root: str, in_container: bool, carry: Dict[str, Any]) -> bool:
         """Check if a video file should be processed (doesn't already have frames)."""
         mapped_video_path = self._map_host_to_container_file(host_video_path, carry) if in_container else host_video_path
@@ -1,11 +1,9 @@
 from task.BaseTask import BaseTask
 from typing import Any, Dict, List
-from whisper.utils import get_writer
 import html
 import json
 import os
 import time
-import whisper
 
 VIDEO_EXTENSIONS = {
     ".mp4", ".mkv", ".mov", ".avi", ".webm",
@@ -13,6 +11,10 @@ VIDEO_EXTENSIONS = {
 }
 
 class WhisperSubtitleTask(BaseTask):
+    def __init__(self) -> None:
+        super().__init__()
+        self._models = {}
+
     def run(self, carry: Dict[str, Any]) -> Dict[str, Any]:
         try:
             dir_path = str(carry.get("dir_path", "")).strip()
@@ -167,6 +169,12 @@ class WhisperSubtitleTask(BaseTask):
     def interval(self) -> int:
         return 60 * 60
 
+    def jitter(self) -> float:
+        return 5 * 60.0
+
+    def depends_on(self) -> List[str]:
+        return ["youtube_downloader"]
+
     def name(self) -> str:
         return "whisper_subtitles"
 
@@ -275,7 +283,11 @@ class WhisperSubtitleTask(BaseTask):
         })
 
     def _get_model(self, model_name: str):
-        return whisper.load_model(model_name)
+        """Load a whisper model once per task instance, so resident workers keep it between runs."""
+        if model_name not in self._models:
+            import whisper
+            self._models[model_name] = whisper.load_model(model_name)
+        return self._models[model_name]
 
     def _filter_processed_videos(self, files: List[str], overwrite: bool) -> tuple[List[str], List[Dict[str, Any]], int]:
         """
@@ -310,6 +322,7 @@ class WhisperSubtitleTask(BaseTask):
             self._print(f"[{idx}/{total}] Transcribing: {video_path}")
             t0 = time.perf_counter()
             result = model.transcribe(video_path, fp16=False, language=language, verbose=False)
+            from whisper.utils import get_writer
             writer = get_writer("srt", os.path.dirname(video_path))
             writer(result, video_path)
             segments = result.get("segments", [])
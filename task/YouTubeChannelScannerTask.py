@@ -1,4 +1,3 @@
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from task.BaseSeleniumTask import BaseSeleniumTask
 from typing import Any, Dict, List
@@ -67,6 +66,7 @@ class YouTubeChannelScannerTask(BaseSeleniumTask):
     def _get_videos(self, html: str) -> Dict[int, Dict[str, Any]]:
         if not html:
             return ''
+        from bs4 import BeautifulSoup
         soup = None
         try:
             soup = BeautifulSoup(html, 'html.parser')
@@ -169,6 +169,7 @@ class YouTubeChannelScannerTask(BaseSeleniumTask):
         return f"https://www.youtube.com/{href}"
 
     def _get_channel_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        from bs4 import BeautifulSoup
         html = data.get('html', '')
         soup = BeautifulSoup(html, 'html.parser')
         channel_data = {}
@@ -6,7 +6,6 @@ import json
 import os
 import re
 import uuid
-import yt_dlp
 
 class YouTubeDownloader(BaseTask):
     def __init__(self):
@@ -107,6 +106,9 @@ class YouTubeDownloader(BaseTask):
     def interval(self) -> int:
         return 60 * 60
 
+    def jitter(self) -> float:
+        return 5 * 60.0
+
     def dependencies(self) -> Dict[str, Any]:
         return {
             "pip": [
@@ -138,6 +140,9 @@ class YouTubeDownloader(BaseTask):
     def requires_connection(self) -> bool:
         return True
 
+    def retry_policy(self) -> Dict[str, Any]:
+        return {"max_attempts": 4, "base_delay": 5.0, "jitter": 0.5}
+
     def max_time_expected(self) -> float | None:
         return None
 
@@ -231,6 +236,7 @@ class YouTubeDownloader(BaseTask):
 
     def _check_video_exists(self, video_url: str, ydl_opts: Dict[str, Any], var_root: str, video_uuid: str) -> tuple:
         """Check if video already exists. Returns (result_dict or None, probe_video_id, probe_title, probe_duration)."""
+        import yt_dlp
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info_probe = ydl.extract_info(video_url, download=False)
             probe_video_id = info_probe.get('id', video_uuid)
@@ -270,6 +276,7 @@ class YouTubeDownloader(BaseTask):
 
     def _perform_download(self, video_url: str, ydl_opts: Dict[str, Any], probe_video_id: str, probe_title: str, probe_duration: int) -> tuple:
         """Download video file and return (info dict, filename)."""
+        import yt_dlp
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(video_url, download=True)
             filename = ydl.prepare_filename(info)
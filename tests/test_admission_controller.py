@@ -0,0 +1,74 @@
+from scheduler.AdmissionController import AdmissionController
+import unittest
+
+
+class AdmissionControllerTest(unittest.TestCase):
+    def test_admits_ready_tasks_that_fit_in_fifo_order(self):
+        controller = AdmissionController(capacity_cpus=4, capacity_memory_gb=8)
+        controller.submit("a", 2, 1)
+        controller.submit("b", 2, 1)
+        controller.submit("c", 1, 1)
+        self.assertEqual(controller.admit(), ["a", "b"])
+        self.assertEqual(controller.waiting(), ["c"])
+        controller.release("a")
+        self.assertEqual(controller.admit(), ["c"])
+        self.assertEqual(controller.reserved_cpus(), 3)
+
+    def test_memory_limits_admission(self):
+        controller = AdmissionController(capacity_cpus=8, capacity_memory_gb=4)
+        controller.submit("a", 1, 3)
+        controller.submit("b", 1, 2)
+        self.assertEqual(controller.admit(), ["a"])
+        self.assertTrue(controller.is_waiting("b"))
+
+    def test_smaller_task_can_pass_a_blocked_head(self):
+        controller = AdmissionController(capacity_cpus=4, capacity_memory_gb=8)
+        controller.reserve("running", 3, 1)
+        controller.submit("big", 2, 1)
+        controller.submit("small", 1, 1)
+        self.assertEqual(controller.admit(), ["small"])
+        self.assertEqual(controller.waiting(), ["big"])
+
+    def test_starved_head_blocks_the_tasks_behind_it(self):
+        controller = AdmissionController(capacity_cpus=4, capacity_memory_gb=8)
+        controller.reserve("running", 3, 1)
+        controller.submit("big", 2, 1)
+        controller.submit("small", 1, 1)
+        controller._ready["big"]['submitted'] -= AdmissionController.STARVATION_TIMEOUT + 1
+        self.assertEqual(controller.admit(), [])
+        self.assertEqual(controller.waiting(), ["big", "small"])
+        controller.release("running")
+        self.assertEqual(controller.admit(), ["big", "small"])
+
+    def test_oversized_task_runs_alone(self):
+        controller = AdmissionController(capacity_cpus=4, capacity_memory_gb=8)
+        controller.submit("huge", 16, 64)
+        controller.submit("small", 1, 1)
+        self.assertEqual(controller.admit(), ["huge"])
+        self.assertEqual(controller.reserved_cpus(), 4)
+        controller.release("huge")
+        self.assertEqual(controller.admit(), ["small"])
+
+    def test_keep_alive_reservations_do_not_block_admission(self):
+        controller = AdmissionController(capacity_cpus=4, capacity_memory_gb=8)
+        controller.reserve("keep_alive", 4, 8, releasable=False)
+        controller.submit("a", 2, 1)
+        self.assertEqual(controller.admit(), ["a"])
+
+    def test_duplicate_submissions_are_ignored(self):
+        controller = AdmissionController(capacity_cpus=4, capacity_memory_gb=8)
+        controller.submit("a", 1, 1)
+        controller.submit("a", 1, 1)
+        self.assertEqual(controller.admit(), ["a"])
+        controller.submit("a", 1, 1)
+        self.assertEqual(controller.waiting(), [])
+
+    def test_withdrawn_task_is_not_admitted(self):
+        controller = AdmissionController(capacity_cpus=4, capacity_memory_gb=8)
+        controller.submit("a", 1, 1)
+        controller.withdraw("a")
+        self.assertEqual(controller.admit(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
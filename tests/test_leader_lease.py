@@ -0,0 +1,57 @@
+from scheduler.LeaderLease import LeaderLease
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+
+class LeaderLeaseTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self._tmp_dir.name, LeaderLease.FILE_NAME)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_only_one_holder_at_a_time(self):
+        lease_a = LeaderLease(self.db_path, "a", 10.0)
+        lease_b = LeaderLease(self.db_path, "b", 10.0)
+        self.assertTrue(lease_a.acquire())
+        self.assertFalse(lease_b.acquire())
+        self.assertTrue(lease_a.acquire())
+        self.assertEqual(lease_b.get_holder(), "a")
+
+    def test_expired_lease_can_be_taken_over(self):
+        lease_a = LeaderLease(self.db_path, "a", 0.1)
+        lease_b = LeaderLease(self.db_path, "b", 0.1)
+        self.assertTrue(lease_a.acquire())
+        time.sleep(0.2)
+        self.assertIsNone(lease_b.get_holder())
+        self.assertTrue(lease_b.acquire())
+        self.assertFalse(lease_a.acquire())
+
+    def test_release_lets_another_holder_acquire(self):
+        lease_a = LeaderLease(self.db_path, "a", 10.0)
+        lease_b = LeaderLease(self.db_path, "b", 10.0)
+        lease_a.acquire()
+        lease_b.release()
+        self.assertFalse(lease_b.acquire())
+        lease_a.release()
+        self.assertTrue(lease_b.acquire())
+
+    def test_locked_lease_file_is_not_leadership(self):
+        lease = LeaderLease(self.db_path, "a", 10.0)
+        lease._conn.execute("PRAGMA busy_timeout = 50")
+        locker = sqlite3.connect(self.db_path, isolation_level=None)
+        locker.execute("BEGIN IMMEDIATE")
+        try:
+            self.assertFalse(lease.acquire())
+        finally:
+            locker.execute("ROLLBACK")
+            locker.close()
+        self.assertTrue(lease.acquire())
+
+
+if __name__ == "__main__":
+    unittest.main()
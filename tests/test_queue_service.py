@@ -0,0 +1,88 @@
+from service.QueueService import QueueService
+import json
+import os
+import tempfile
+import unittest
+
+
+class QueueServiceTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.queue_file = os.path.join(self._tmp_dir.name, "queue.txt")
+        QueueService._cache.clear()
+
+    def tearDown(self):
+        QueueService._cache.clear()
+        self._tmp_dir.cleanup()
+
+    def _replay(self):
+        """Read the queue the way a freshly started process would."""
+        QueueService._cache.clear()
+        return QueueService.read_queue(self.queue_file)
+
+    def _lines(self):
+        with open(self.queue_file, 'r', encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_missing_file_is_an_empty_queue(self):
+        self.assertEqual(QueueService.read_queue(self.queue_file), [])
+        self.assertIsNone(QueueService.pop(self.queue_file))
+        self.assertEqual(QueueService.get_queue_size(self.queue_file), 0)
+
+    def test_push_and_pop_are_journaled(self):
+        QueueService.push(self.queue_file, ["a", "b", "c"])
+        self.assertEqual(QueueService.pop(self.queue_file), "a")
+        self.assertEqual(QueueService.get_queue_size(self.queue_file), 2)
+        self.assertEqual(len(self._lines()), 4)
+        self.assertEqual(self._replay(), ["b", "c"])
+
+    def test_journal_is_compacted_into_a_snapshot(self):
+        QueueService.push(self.queue_file, [str(i) for i in range(QueueService.COMPACT_MIN_OPS)])
+        self.assertEqual(len(self._lines()), QueueService.COMPACT_MIN_OPS)
+        QueueService.pop(self.queue_file)
+        expected = [str(i) for i in range(1, QueueService.COMPACT_MIN_OPS)]
+        self.assertEqual(self._lines(), [json.dumps(expected)])
+        self.assertEqual(self._replay(), expected)
+        QueueService.push(self.queue_file, ["new"])
+        self.assertEqual(self._replay(), expected + ["new"])
+
+    def test_torn_last_line_is_dropped(self):
+        QueueService.push(self.queue_file, ["a", "b"])
+        with open(self.queue_file, 'a', encoding='utf-8') as f:
+            f.write('{"op": "pu')
+        self.assertEqual(self._replay(), ["a", "b"])
+        QueueService.push(self.queue_file, ["c"])
+        self.assertEqual(self._replay(), ["a", "b", "c"])
+
+    def test_old_format_replays_as_snapshots(self):
+        with open(self.queue_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(["a", "b", "c"]) + "\n" + json.dumps(["b", "c"]) + "\n")
+        self.assertEqual(self._replay(), ["b", "c"])
+        self.assertEqual(QueueService.pop(self.queue_file), "b")
+        self.assertEqual(self._replay(), ["c"])
+
+    def test_malformed_records_are_skipped(self):
+        with open(self.queue_file, 'w', encoding='utf-8') as f:
+            for record in [["a"], {"op": "push"}, {"op": "push", "item": "b"}, "text", {"op": "other"}]:
+                f.write(json.dumps(record) + "\n")
+        self.assertEqual(self._replay(), ["a", "b"])
+
+    def test_rewrite_by_another_process_is_noticed(self):
+        QueueService.write_queue(self.queue_file, ["aa", "bb"])
+        self.assertEqual(QueueService.read_queue(self.queue_file), ["aa", "bb"])
+        # Another process compacts the journal into a file of the same size
+        tmp_file = f"{self.queue_file}.other"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(["cc", "dd"]) + "\n")
+        os.replace(tmp_file, self.queue_file)
+        self.assertEqual(QueueService.pop(self.queue_file), "cc")
+
+    def test_merge_and_filter_keeps_queue_priority(self):
+        QueueService.write_queue(self.queue_file, ["a", "b"])
+        merged = QueueService.merge_and_filter_queue(self.queue_file, ["c", "a", "d"], lambda item: item != "d")
+        self.assertEqual(merged, ["a", "b", "c"])
+        self.assertEqual(self._replay(), ["a", "b", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
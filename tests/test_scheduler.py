@@ -0,0 +1,64 @@
+from scheduler.Scheduler import Scheduler
+import threading
+import time
+import unittest
+
+
+class SchedulerTest(unittest.TestCase):
+    def test_returns_due_tasks_in_due_order(self):
+        scheduler = Scheduler()
+        now = time.time()
+        scheduler.schedule("b", now - 1)
+        scheduler.schedule("later", now + 100)
+        scheduler.schedule("a", now - 2)
+        self.assertEqual(scheduler.wait(0), ["a", "b"])
+        self.assertEqual(scheduler.wait(0), [])
+
+    def test_reschedule_keeps_only_the_latest_due_time(self):
+        scheduler = Scheduler()
+        now = time.time()
+        scheduler.schedule("a", now - 1)
+        scheduler.schedule("a", now + 100)
+        self.assertEqual(scheduler.wait(0), [])
+        scheduler.schedule("a", now - 1)
+        self.assertEqual(scheduler.wait(0), ["a"])
+        self.assertEqual(scheduler.wait(0), [])
+
+    def test_wait_returns_empty_after_max_wait(self):
+        scheduler = Scheduler()
+        scheduler.schedule("a", time.time() + 100)
+        start = time.time()
+        self.assertEqual(scheduler.wait(0.1), [])
+        self.assertGreaterEqual(time.time() - start, 0.1)
+
+    def test_wait_wakes_up_when_the_next_task_is_due(self):
+        scheduler = Scheduler()
+        scheduler.schedule("a", time.time() + 0.1)
+        start = time.time()
+        self.assertEqual(scheduler.wait(5), ["a"])
+        self.assertLess(time.time() - start, 1)
+
+    def test_notify_wakes_up_the_waiting_loop(self):
+        scheduler = Scheduler()
+        threading.Timer(0.1, scheduler.notify).start()
+        start = time.time()
+        self.assertEqual(scheduler.wait(), [])
+        self.assertLess(time.time() - start, 1)
+
+    def test_notify_before_wait_is_not_lost(self):
+        scheduler = Scheduler()
+        scheduler.notify()
+        start = time.time()
+        self.assertEqual(scheduler.wait(5), [])
+        self.assertLess(time.time() - start, 1)
+
+    def test_schedule_from_another_thread_wakes_up_the_waiting_loop(self):
+        scheduler = Scheduler()
+        threading.Timer(0.1, scheduler.schedule, args=("a", time.time())).start()
+        start = time.time()
+        self.assertEqual(scheduler.wait(5), ["a"])
+        self.assertLess(time.time() - start, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+from scheduler.StateStore import StateStore
+import os
+import tempfile
+import unittest
+
+
+class StateStoreTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self._tmp_dir.name, "state", StateStore.FILE_NAME)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_last_starts_survive_a_restart(self):
+        store = StateStore(self.db_path)
+        store.record_start("a", 100.0)
+        store.record_finish("a", 110.0, 0)
+        store.record_start("a", 200.0)
+        store.record_finish("b", 120.0, 1)
+        self.assertEqual(StateStore(self.db_path).get_last_starts(), {"a": 200.0})
+
+    def test_running_containers_are_tracked_per_task(self):
+        store = StateStore(self.db_path)
+        store.add_running_container("a", "id1")
+        store.add_running_container("a", "id2")
+        store.add_running_container("b", "id3")
+        store.remove_running_container("b")
+        self.assertEqual(StateStore(self.db_path).get_running_containers(), {"a": "id2"})
+
+
+if __name__ == "__main__":
+    unittest.main()
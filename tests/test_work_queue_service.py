@@ -0,0 +1,88 @@
+from service.WorkQueueService import WorkQueueService
+import os
+import tempfile
+import time
+import unittest
+
+
+class WorkQueueServiceTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self._tmp_dir.name, WorkQueueService.FILE_NAME)
+        self.queues = []
+
+    def tearDown(self):
+        for queue in self.queues:
+            queue.close()
+        self._tmp_dir.cleanup()
+
+    def _open(self, lease_seconds: float = WorkQueueService.LEASE_SECONDS) -> WorkQueueService:
+        queue = WorkQueueService(self.db_path, lease_seconds)
+        self.queues.append(queue)
+        return queue
+
+    def test_add_keeps_order_and_skips_queued_items(self):
+        queue = self._open()
+        self.assertEqual(queue.add(["a", "b"]), 2)
+        self.assertEqual(queue.add(["b", "c"]), 1)
+        self.assertEqual(queue.claim("worker", 3), ["a", "b", "c"])
+
+    def test_consumers_claim_distinct_items(self):
+        queue_a = self._open()
+        queue_b = self._open()
+        queue_a.add(["a", "b", "c"])
+        self.assertEqual(queue_a.claim("a"), ["a"])
+        self.assertEqual(queue_b.claim("b", 5), ["b", "c"])
+        self.assertEqual(queue_a.claim("a"), [])
+        self.assertEqual(queue_a.size(), 3)
+
+    def test_ack_removes_the_item(self):
+        queue = self._open()
+        queue.add(["a"])
+        queue.claim("worker")
+        self.assertFalse(queue.ack("a", "other"))
+        self.assertTrue(queue.ack("a", "worker"))
+        self.assertEqual(queue.size(), 0)
+
+    def test_expired_lease_is_handed_out_again(self):
+        queue_a = self._open(lease_seconds=0.1)
+        queue_b = self._open(lease_seconds=0.1)
+        queue_a.add(["a"])
+        self.assertEqual(queue_a.claim("a"), ["a"])
+        self.assertEqual(queue_b.claim("b"), [])
+        time.sleep(0.2)
+        self.assertEqual(queue_b.claim("b"), ["a"])
+        self.assertFalse(queue_a.ack("a", "a"))
+        self.assertTrue(queue_b.ack("a", "b"))
+
+    def test_renew_extends_the_lease(self):
+        queue_a = self._open(lease_seconds=0.3)
+        queue_b = self._open(lease_seconds=0.3)
+        queue_a.add(["a"])
+        queue_a.claim("a")
+        time.sleep(0.2)
+        queue_a.renew(["a"], "a")
+        time.sleep(0.2)
+        self.assertEqual(queue_b.claim("b"), [])
+        self.assertTrue(queue_a.ack("a", "a"))
+
+    def test_release_puts_the_item_back(self):
+        queue = self._open()
+        queue.add(["a", "b"])
+        queue.claim("worker")
+        queue.release("a", "worker")
+        self.assertEqual(queue.claim("other", 2), ["a", "b"])
+
+    def test_items_survive_reopening(self):
+        queue = self._open()
+        queue.add(["a", "b"])
+        queue.claim("worker")
+        queue.close()
+        self.queues.remove(queue)
+        reopened = self._open()
+        self.assertEqual(reopened.size(), 2)
+        self.assertEqual(reopened.claim("other"), ["b"])
+
+
+if __name__ == "__main__":
+    unittest.main()